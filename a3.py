@@ -47,12 +47,16 @@ from game_make13 import Make13Game
 from game_lucky7 import Lucky7Game
 from game_unlimited import UnlimitedGame
 
+# Import the solver that drives the automatic game
+from solver import GreedySolver
+
 # Import platform module
 import platform
 
 # Import the high score manager and fire it up
+# Compact grids are only decoded when the high scores window draws them
 import highscores as hs
-hiscores = hs.HighScoreManager()
+hiscores = hs.HighScoreManager(compact_grids=True)
 
 # Determine OS (necessary for OS-specific key bindings)
 SYSTEM = platform.system()
@@ -162,6 +166,7 @@ class AutoPlay(BaseLoloApp):
 
         self._master = master
         self._move_delay = 350
+        self._solver = GreedySolver(budget=0.05)
 
         if autoplay == 1:
             super().__init__(master)
@@ -182,18 +187,11 @@ class AutoPlay(BaseLoloApp):
         self._master.after(delay, self.move)
 
     def move(self):
-        """Finds a connected tile randomly and activates it."""
-        connections = list(self._game.find_groups())
-
-        if connections:
-            # pick random valid move
-            cells = list()
+        """Finds the tile that scores the most and activates it."""
+        position = self._solver.choose(self._game)
 
-            for connection in connections:
-                for cell in connection:
-                    cells.append(cell)
-
-            self.activate(random.choice(cells))
+        if position is not None:
+            self.activate(position)
 
     def game_over(self):
         """
@@ -226,81 +224,47 @@ class HighScores(AutoPlay):
         self.window = master
         self.window.title('Highscores')
 
-        # Get the list of sorted scores
-        self.hiscores = hiscores.get_sorted_data()
-
-        # Dicts with best players' scores
-        self.bestplayer = self.hiscores[0]
-        self.p2 = self.hiscores[1]
-        self.p3 = self.hiscores[2]
-        self.p4 = self.hiscores[3]
-        self.p5 = self.hiscores[4]
-        self.p6 = self.hiscores[5]
-        self.p7 = self.hiscores[6]
-        self.p8 = self.hiscores[7]
-        self.p9 = self.hiscores[8]
-        self.p10 = self.hiscores[9]
+        # Get the names & scores, best first; grids are only decoded to draw
+        self.hiscores = hiscores.get_headers()
 
         # Display the best player's details
-        self.label_bestplayer = tk.Label(self.window, text='Best Player: ' +
-                                         self.bestplayer['name'] + ' with ' +
-                                         str(self.bestplayer['score']) +
-                                         ' points!')
+        if self.hiscores:
+            name, score = self.hiscores[0]
+            text = 'Best Player: ' + name + ' with ' + str(score) + ' points!'
+        else:
+            text = 'No high scores yet!'
+
+        self.label_bestplayer = tk.Label(self.window, text=text)
         self.label_bestplayer.grid(row=0, column=0)
 
         # Create a frame for the static grid
         self.frame_grid = tk.Frame(self.window)
         self.frame_grid.grid(row=1, column=0)
 
-        # Do something
-        self.playergrid = self.bestplayer['grid']
-        self.game = RegularGame.deserialize(self.playergrid)
-        super(AutoPlay, self).__init__(self.frame_grid, self.game)
+        # Draw the best player's final grid, as is, unless it is empty
+        self.playergrid = hiscores.get_grid(0) if self.hiscores else []
+        if self.playergrid and self.playergrid[0]:
+            size = len(self.playergrid), len(self.playergrid[0])
+            self.game = RegularGame.deserialize(self.playergrid, size=size,
+                                                autofill=False,
+                                                animation=False)
+            super(AutoPlay, self).__init__(self.frame_grid, self.game)
 
         self.label_other = tk.Label(self.window, text='Other top scorers:')
         self.label_other.grid(row=2, column=0, sticky=tk.N)
 
-        # Display the other 'best' player's names
-        self.label_p2name = tk.Label(self.window, text=self.p2['name'])
-        self.label_p3name = tk.Label(self.window, text=self.p3['name'])
-        self.label_p4name = tk.Label(self.window, text=self.p4['name'])
-        self.label_p5name = tk.Label(self.window, text=self.p5['name'])
-        self.label_p6name = tk.Label(self.window, text=self.p6['name'])
-        self.label_p7name = tk.Label(self.window, text=self.p7['name'])
-        self.label_p8name = tk.Label(self.window, text=self.p8['name'])
-        self.label_p9name = tk.Label(self.window, text=self.p9['name'])
-        self.label_p10name = tk.Label(self.window, text=self.p10['name'])
-
-        self.label_p2name.grid(row=3, column=0, sticky=tk.W)
-        self.label_p3name.grid(row=4, column=0, sticky=tk.W)
-        self.label_p4name.grid(row=5, column=0, sticky=tk.W)
-        self.label_p5name.grid(row=6, column=0, sticky=tk.W)
-        self.label_p6name.grid(row=7, column=0, sticky=tk.W)
-        self.label_p7name.grid(row=8, column=0, sticky=tk.W)
-        self.label_p8name.grid(row=9, column=0, sticky=tk.W)
-        self.label_p9name.grid(row=10, column=0, sticky=tk.W)
-        self.label_p10name.grid(row=11, column=0, sticky=tk.W)
-
-        # Display their scores
-        self.label_p2score = tk.Label(self.window, text=self.p2['score'])
-        self.label_p3score = tk.Label(self.window, text=self.p3['score'])
-        self.label_p4score = tk.Label(self.window, text=self.p4['score'])
-        self.label_p5score = tk.Label(self.window, text=self.p5['score'])
-        self.label_p6score = tk.Label(self.window, text=self.p6['score'])
-        self.label_p7score = tk.Label(self.window, text=self.p7['score'])
-        self.label_p8score = tk.Label(self.window, text=self.p8['score'])
-        self.label_p9score = tk.Label(self.window, text=self.p9['score'])
-        self.label_p10score = tk.Label(self.window, text=self.p10['score'])
-
-        self.label_p2score.grid(row=3, column=0, sticky=tk.E)
-        self.label_p3score.grid(row=4, column=0, sticky=tk.E)
-        self.label_p4score.grid(row=5, column=0, sticky=tk.E)
-        self.label_p5score.grid(row=6, column=0, sticky=tk.E)
-        self.label_p6score.grid(row=7, column=0, sticky=tk.E)
-        self.label_p7score.grid(row=8, column=0, sticky=tk.E)
-        self.label_p8score.grid(row=9, column=0, sticky=tk.E)
-        self.label_p9score.grid(row=10, column=0, sticky=tk.E)
-        self.label_p10score.grid(row=11, column=0, sticky=tk.E)
+        # Display the other top players' names & scores
+        self.labels_name = []
+        self.labels_score = []
+
+        for row, (name, score) in enumerate(self.hiscores[1:10], start=3):
+            label_name = tk.Label(self.window, text=name)
+            label_name.grid(row=row, column=0, sticky=tk.W)
+            self.labels_name.append(label_name)
+
+            label_score = tk.Label(self.window, text=score)
+            label_score.grid(row=row, column=0, sticky=tk.E)
+            self.labels_score.append(label_score)
 
 
 class LoloApp(BaseLoloApp):
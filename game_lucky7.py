@@ -12,6 +12,8 @@ __version__ = "1.1.2"
 class LuckyTile(game_make13.LevelTile):
     """Tile whose value & type are equal, incrementing by one when joined."""
 
+    __slots__ = ('_lucky',)
+
     def __init__(self, value=1, lucky=7):
         """Constructor
 
@@ -23,10 +25,10 @@ class LuckyTile(game_make13.LevelTile):
         self._lucky = lucky
 
     def is_max(self):
-        return self.get_value() == self._lucky
+        return self._value == self._lucky
 
     def is_combo_max(self):
-        return self.is_max()
+        return self._value == self._lucky
 
 
 class Lucky7Game(game_make13.Make13Game):
@@ -40,7 +42,7 @@ class Lucky7Game(game_make13.Make13Game):
     GAME_NAME = "Lucky 7"
 
     def __init__(self, size=(6, 6), initial_tiles=4, lucky_value=7, min_group=3,
-                 animation=True, autofill=True):
+                 animation=True, autofill=True, seed=None):
         """Constructor
 
         Parameters:
@@ -51,13 +53,15 @@ class Lucky7Game(game_make13.Make13Game):
                              connected group to be joinable.
             animation (bool): If True, animation will be enabled.
             autofill (bool): Automatically fills the grid iff True.
+            seed (*): Seed for the game's random number generator. Randomly
+                      seeded if None.
         """
 
         self.lucky_value = lucky_value
 
         super().__init__(size=size, initial_tiles=initial_tiles,
                          goal_value=lucky_value + 1, min_group=min_group,
-                         animation=animation, autofill=autofill)
+                         animation=animation, autofill=autofill, seed=seed)
 
     def get_default_score(self):
         """(int) Returns the default score."""
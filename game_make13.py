@@ -1,5 +1,4 @@
 """Modelling classes for Make 13 Lolo game mode."""
-import tile_generators
 
 __author__ = "Benjamin Martin and Brae Webb"
 __copyright__ = "Copyright 2017, The University of Queensland"
@@ -14,6 +13,8 @@ from modules.weighted_selector import WeightedSelector
 class LevelTile(model.AbstractTile):
     """Tile whose value & type are equal, incrementing by one when joined."""
 
+    __slots__ = ()
+
     def __init__(self, value=1):
         """Constructor
 
@@ -24,7 +25,7 @@ class LevelTile(model.AbstractTile):
 
     def get_type(self):
         """Returns the type (value) of this tile."""
-        return self.get_value()
+        return self._value
 
     def is_max(self):
         return False
@@ -57,7 +58,7 @@ class Make13Game(game_regular.RegularGame):
     GAME_NAME = "Make 13"
 
     def __init__(self, size=(6, 6), initial_tiles=4, goal_value=13, min_group=2,
-                 animation=True, autofill=True):
+                 animation=True, autofill=True, seed=None):
         """Constructor
 
         Parameters:
@@ -68,41 +69,49 @@ class Make13Game(game_regular.RegularGame):
                              connected group to be joinable.
             animation (bool): If True, animation will be enabled.
             autofill (bool): Automatically fills the grid iff True.
-
+            seed (*): Seed for the game's random number generator. Randomly
+                      seeded if None.
         """
         self.goal_value = goal_value
 
         self.initial_tiles = initial_tiles
 
         super().__init__(size=size, min_group=min_group, animation=animation,
-                         autofill=False)
+                         autofill=False, seed=seed)
 
-        self._selector = WeightedSelector({1: 1})
-        self.reset()
+        # Set the weights directly; resetting would fill the regular grid,
+        # drawing from the game's random number generator
+        self._selector = WeightedSelector(self._get_initial_weights(),
+                                          rng=self._rng)
 
-        generator = tile_generators.WeightedGenerator(self._selector,
-                                                      self._construct_tile)
+        generator = self._create_generator()
 
         rows, columns = size
-        self.grid = model.LoloGrid(generator, rows=rows, columns=columns,
-                                   animation=animation)
+        self.grid = self.GRID_CLASS(generator, rows=rows, columns=columns,
+                                    animation=animation)
         if autofill:
             self.grid.fill()
-            self._score = self.get_default_score()
+        self._score = self.get_default_score()
 
         self.generator = generator
 
     def get_default_score(self):
-        """(int) Returns the default score."""
-        return max(tile.get_value() for _, tile in self.grid.items())
+        """(int) Returns the default score: the highest tile value, or the
+        highest initial tile value if the grid has not been filled."""
+        values = [tile.get_value() for _, tile in self.grid.items()
+                  if tile is not None]
+        return max(values) if values else self.initial_tiles
 
     def reset(self):
         """Resets the game."""
-        weights = {i: self.get_tile_weight(i) for i in
-                   range(1, self.initial_tiles + 1)}
-        self._selector.update(weights, clear=True)
+        self._selector.update(self._get_initial_weights(), clear=True)
         super().reset()
 
+    def _get_initial_weights(self):
+        """(dict<int, float>) Returns the weights of the initial tiles."""
+        return {i: self.get_tile_weight(i) for i in
+                range(1, self.initial_tiles + 1)}
+
     def get_tile_weight(self, value):
         """(float) Returns the weighting for a tile of given value."""
         return 2 ** (self.goal_value - value)
@@ -1,5 +1,7 @@
 """Modelling classes for Regular Lolo game mode."""
 
+import random
+
 import tile_generators
 import model
 import modules.matrix as matrix
@@ -11,6 +13,38 @@ __license__ = "MIT"
 __version__ = "1.1.2"
 
 
+class RegularTileSpec:
+    """Constants shared by every RegularTile in a game."""
+
+    __slots__ = ('max_type', 'max_value')
+
+    _specs = {}
+
+    def __init__(self, max_type='max', max_value=50):
+        """
+        Constructor
+
+        Parameters:
+            max_type (*): The type of a maximum tile.
+            max_value (int): The value of a maximum tile.
+        """
+        self.max_type = max_type
+        self.max_value = max_value
+
+    @classmethod
+    def get(cls, max_type='max', max_value=50):
+        """(RegularTileSpec) Returns a shared spec with the given constants."""
+        key = max_type, max_value
+        spec = cls._specs.get(key)
+        if spec is None:
+            spec = cls._specs[key] = cls(max_type, max_value)
+        return spec
+
+    def __repr__(self):
+        return "{}({!r}, {!r})".format(self.__class__.__name__, self.max_type,
+                                       self.max_value)
+
+
 class RegularTile(model.AbstractTile):
     """Regular Lolo tile.
 
@@ -18,7 +52,9 @@ class RegularTile(model.AbstractTile):
     set to the maximum. Values higher than the maximum can exist when maximum
     tiles are joined (normally only in multiples of the maximum value)."""
 
-    def __init__(self, type, value=1, max_type='max', max_value=50):
+    __slots__ = ('_spec',)
+
+    def __init__(self, type, value=1, max_type='max', max_value=50, spec=None):
         """
         Constructor
 
@@ -29,19 +65,23 @@ class RegularTile(model.AbstractTile):
             value (int): The value of this tile. Defaults to 1.
             max_type (*): The type of a maximum tile.
             max_value (int): The value of a maximum tile.
+            spec (RegularTileSpec): The maximum type & value, shared between
+                                    tiles. Overrides max_type & max_value.
         """
 
         super().__init__(type, value)
 
-        self._max_type = max_type
-        self._max_value = max_value
+        if spec is None:
+            spec = RegularTileSpec.get(max_type, max_value)
+
+        self._spec = spec
 
-        if type == max_type and value < max_value:
+        if type == spec.max_type and value < spec.max_value:
             self.maximize()
 
     def get_display_value(self):
         """(int|None) Returns the display value of this tile."""
-        value = self.get_value()
+        value = self._value
         return None if value == 1 else value
 
     def join(self, others):
@@ -52,24 +92,27 @@ class RegularTile(model.AbstractTile):
             others (iterable(RegularTile)): The other tiles to join.
         """
         for other in others:
-            if isinstance(other.get_value(), int):
-                self._value += other.get_value()
+            value = other._value
+            if isinstance(value, int):
+                self._value += value
 
-        if self._type != self._max_type and self._value >= self._max_value:
+        spec = self._spec
+        if self._type != spec.max_type and self._value >= spec.max_value:
             self.maximize()
 
     def maximize(self):
         """Converts this tile to a max tile."""
-        self._value = self._max_value
-        self._type = self._max_type
+        self._value = self._spec.max_value
+        self._type = self._spec.max_type
 
     def is_max(self):
         """(bool) Returns True iff this tile is a maximum tile."""
-        return self._type == self._max_type
+        return self._type == self._spec.max_type
 
     def is_combo_max(self):
         """(bool) Returns True iff this tile is a combined maximum tile."""
-        return self.is_max() and self._value > self._max_value
+        spec = self._spec
+        return self._type == spec.max_type and self._value > spec.max_value
 
     def __eq__(self, other):
         """(bool) Returns True iff this tile's type is equivalent to other's.
@@ -77,7 +120,7 @@ class RegularTile(model.AbstractTile):
         Parameters:
             other (RegularTile): The tile to check for equivalence.
         """
-        return self._type == other.get_type()
+        return self._type == other._type
 
 
 class RegularGame(model.AbstractGame):
@@ -88,9 +131,14 @@ class RegularGame(model.AbstractGame):
 
     GAME_NAME = "Regular"
 
+    # The AbstractTileGenerator class used to generate tiles from the selector,
+    # or None for tile_generators.WeightedGenerator. Resolved when a generator
+    # is created, as tile_generators imports this module
+    GENERATOR_CLASS = None
+
     def __init__(self, size=(6, 6), types=3, min_group=3,
                  max_tile_value=50, max_tile_type='max', normal_weight=20,
-                 max_weight=2, animation=True, autofill=True):
+                 max_weight=2, animation=True, autofill=True, seed=None):
         """Constructor
 
         Parameters:
@@ -104,7 +152,10 @@ class RegularGame(model.AbstractGame):
                               tile will be generated.
             animation (bool): If True, animation will be enabled.
             autofill (bool): Automatically fills the grid iff True.
+            seed (*): Seed for the game's random number generator. Randomly
+                      seeded if None.
         """
+        rng = random.Random(seed)
 
         # Basic properties
         self.max_tile_value = max_tile_value
@@ -112,29 +163,102 @@ class RegularGame(model.AbstractGame):
         self.types = types
         self._max_unlocked = False
 
+        # Constants shared by every tile
+        self._tile_spec = RegularTileSpec(max_tile_type, max_tile_value)
+
         # Tile probabilities
         self.normal_likelihood = normal_weight
         self.max_likelihood = max_weight
 
         weighted_types = {i: normal_weight for i in range(1, types + 1)}
-        self._selector = WeightedSelector(weighted_types)
+        self._selector = WeightedSelector(weighted_types, rng=rng)
 
-        generator = tile_generators.WeightedGenerator(self._selector,
-                                                      self._construct_tile)
+        generator = self._create_generator()
 
         super().__init__(size, generator, min_group, animation=animation,
-                         autofill=autofill)
+                         autofill=autofill, rng=rng)
 
     def get_default_score(self):
         """(int) Returns the default score."""
         return 0
 
+    def _create_generator(self):
+        """(AbstractTileGenerator) Returns a new generator of tiles from the
+        game's selector."""
+        generator_class = self.GENERATOR_CLASS
+        if generator_class is None:
+            generator_class = tile_generators.WeightedGenerator
+        return generator_class(self._selector, self._construct_tile)
+
     def reset(self):
         """Resets the game."""
         super().reset()
 
         self._lock_max()
 
+    def _setup_clone(self):
+        """Gives a newly cloned game its own selector & generator, drawing from
+        its own random number generator."""
+        state = self.generator.get_state()
+        self._selector = self._selector.clone(rng=self._rng)
+        self.set_generator(self._create_generator())
+        self.generator.set_state(state)
+
+    def _get_state(self):
+        """(dict<str, *>) Returns the state of this game outside of its grid &
+        random number generator, including its tile weights & generator
+        state."""
+        state = super()._get_state()
+        # As pairs, since json would turn integer keys into strings
+        state["weights"] = [list(item) for item in
+                            self._selector.get_weights().items()]
+        state["max_unlocked"] = self._max_unlocked
+        state["generator"] = self.generator.get_state()
+        return state
+
+    def _set_state(self, state):
+        """Sets the state of this game outside of its grid & random number
+        generator.
+
+        Parameters:
+            state (dict<str, *>): A state returned by _get_state.
+        """
+        super()._set_state(state)
+        self._selector.update(dict(state["weights"]), clear=True)
+        self._max_unlocked = state["max_unlocked"]
+        self.generator.set_state(state.get("generator"))
+
+    def record_tiles(self, stream=None):
+        """Records the selection of every tile generated from now on.
+
+        To record a whole game, construct it with autofill=False, then call
+        this method before reset.
+
+        Parameters:
+            stream (tile_generators.TileStream): The stream to record to.
+                                                 Defaults to a new stream.
+
+        Return:
+            tile_generators.TileStream: The stream being recorded to.
+        """
+        generator = tile_generators.RecordingGenerator(
+            self._selector, self._construct_tile, stream)
+        self.set_generator(generator)
+        return generator.get_stream()
+
+    def replay_tiles(self, stream, start=0):
+        """Generates every tile from now on by replaying a recorded stream.
+
+        To replay a whole game, construct it with autofill=False, then call
+        this method before reset.
+
+        Parameters:
+            stream (tile_generators.TileStream): The stream to replay.
+            start (int): The index of the first selection to replay.
+        """
+        self.set_generator(tile_generators.ReplayGenerator(
+            stream, self._construct_tile, start))
+
     def _construct_tile(self, type, position, *args, **kwargs):
         """(RegularTile) Returns a new tile from the generator's selection.
 
@@ -144,7 +268,7 @@ class RegularGame(model.AbstractGame):
             *args: Extra positional arguments for the tile.
             **kwargs: Extra keyword arguments for the tile.
         """
-        return RegularTile(type, *args, max_value=self.max_tile_value, **kwargs)
+        return RegularTile(type, *args, spec=self._tile_spec, **kwargs)
 
     def _check_unlock_max(self, current):
         """Unlocks the max tile if the current tile is a max tile.
@@ -186,12 +310,13 @@ class RegularGame(model.AbstractGame):
             Yields None for each frame of drops and "DONE" when the dropping
             has finished.
         """
-        connected_cells = self._attempt_activate_collect(position)
-        connected_cells.remove(position)
+        connected_cells = self._attempt_activate_collect(position) - {position}
 
         self._resolving = True
+        self._begin_move()
 
-        current = self.grid[position]
+        # Join into a copy, since tiles may be shared with clones of the game
+        current = self.grid[position] = self.grid[position].copy()
         connected_tiles = [self.grid[cell] for cell in connected_cells]
 
         # Join tiles
@@ -213,6 +338,8 @@ class RegularGame(model.AbstractGame):
         # Perform combo
         yield from self._explode_combo(position)
 
+        self._end_move()
+
         # Final step
         yield "DONE"
 
@@ -223,6 +350,9 @@ class RegularGame(model.AbstractGame):
         if self.game_over():
             self.emit('game_over')
 
+        # Prepare upcoming tiles while idle
+        self.generator.prefetch()
+
     def remove(self, *positions):
         """Attempts to remove the tiles at the given positions.
 
@@ -235,6 +365,7 @@ class RegularGame(model.AbstractGame):
         """
 
         self._resolving = True
+        self._begin_move()
 
         connected_cells = positions
         connected_tiles = [self.grid[cell] for cell in connected_cells]
@@ -244,6 +375,8 @@ class RegularGame(model.AbstractGame):
 
         yield from self.grid.replace_blanks()
 
+        self._end_move()
+
         # Final step
         yield "DONE"
 
@@ -254,6 +387,9 @@ class RegularGame(model.AbstractGame):
         if self.game_over():
             self.emit('game_over')
 
+        # Prepare upcoming tiles while idle
+        self.generator.prefetch()
+
     def find_tile_position(self, tile):
         """(tuple<int, int>) Returns the row, column position of the tile if it
         exists in the game grid, else None."""
@@ -18,7 +18,7 @@ class UnlimitedGame(game_regular.RegularGame):
     GAME_NAME = "Unlimited"
 
     def __init__(self, size=(8, 8), types=4, min_group=3,
-                 animation=True, autofill=True):
+                 animation=True, autofill=True, seed=None):
         """Constructor
 
         Parameters:
@@ -28,26 +28,19 @@ class UnlimitedGame(game_regular.RegularGame):
                              connected group to be joinable.
             animation (bool): If True, animation will be enabled.
             autofill (bool): Automatically fills the grid iff True.
+            seed (*): Seed for the game's random number generator. Randomly
+                      seeded if None.
         """
 
+        # Tiles are never maximised
         super().__init__(size=size, types=types, min_group=min_group,
-                         animation=animation, autofill=autofill)
+                         max_tile_value=math.inf, animation=animation,
+                         autofill=autofill, seed=seed)
 
     def get_default_score(self):
         """(int) Returns the default score."""
         return max(tile.get_value() for _, tile in self.grid.items())
 
-    def _construct_tile(self, type, position, *args, **kwargs):
-        """(RegularTile) Returns a new tile from the generator's selection.
-
-        Parameters:
-            type (*): The type of the tile.
-            position (tuple<int, int>): The position the tile will initially exist in. Unused.
-            *args: Extra positional arguments for the tile.
-            **kwargs: Extra keyword arguments for the tile.
-        """
-        return game_regular.RegularTile(type, *args, max_value=math.inf, **kwargs)
-
     def update_score_on_activate(self, current, connections):
         """Updates the score based upon the current tile & connected tiles that
         were joined to it.
@@ -1,13 +1,190 @@
+import glob
+import heapq
 import json
+import os
+import shutil
+import sqlite3
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+from modules import grid_codec
+
+
+class _FileLock:
+    """An exclusive lock between processes, held on a lock file for the
+    duration of a with statement. Not reentrant."""
+
+    def __init__(self, path):
+        """Constructor
+
+        Parameters:
+            path (str): The name of the lock file. Created if it does not exist.
+        """
+        self._path = path
+        self._file = None
+
+    def __enter__(self):
+        """Blocks until the lock is acquired."""
+        self._file = open(self._path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            while True:
+                try:
+                    # Each call retries for ~10 seconds, then raises OSError;
+                    # keep waiting, as flock does
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+
+class Leaderboard:
+    """The top scoring records of a gamemode.
+
+    Records are kept in a min-heap of (score, sequence, record) entries, so the
+    lowest score can be found & replaced in O(log k) time. Sequence numbers
+    give the place of each record in the order of records; a record replacing
+    another takes its place. Of two equal scores, the earlier record ranks
+    lower. Ordered views are cached until the next change.
+    """
+
+    def __init__(self, records=(), top_scores=None):
+        """Constructs a Leaderboard from existing records.
+
+        Parameters:
+            records (iterable(dict<str, *>)): The records, oldest first.
+            top_scores (int): If given, only this many of the highest scoring
+                              records are kept.
+        """
+        self._heap = [(record["score"], sequence, record)
+                      for sequence, record in enumerate(records)]
+        heapq.heapify(self._heap)
+        self._next = len(self._heap)
+
+        self._ordered = self._sorted = None
+
+        if top_scores is not None:
+            self.trim(top_scores)
+
+    def _changed(self):
+        """Discards the cached views after a change."""
+        self._ordered = self._sorted = None
+
+    def trim(self, top_scores):
+        """Removes the lowest scoring records beyond the top scores.
+
+        Parameters:
+            top_scores (int): The number of records to keep.
+        """
+        heap = self._heap
+        if len(heap) <= top_scores:
+            return
+
+        while len(heap) > top_scores:
+            heapq.heappop(heap)
+        self._changed()
+
+    def insert(self, record, top_scores):
+        """Adds a record if it is among the top scores, replacing the lowest
+        scoring record if there are already top_scores records.
+
+        Parameters:
+            record (dict<str, *>): The record to add.
+            top_scores (int): The number of records to keep.
+
+        Return:
+            bool: True iff the record was added.
+        """
+        heap = self._heap
+        score = record["score"]
+
+        if len(heap) < top_scores:
+            heapq.heappush(heap, (score, self._next, record))
+            self._next += 1
+        elif heap and score > heap[0][0]:
+            heapq.heapreplace(heap, (score, heap[0][1], record))
+        else:
+            return False
+
+        self._changed()
+        return True
+
+    def replace(self, old_score, record):
+        """Replaces the oldest record with the old score, keeping its place in
+        the order of records.
+
+        Parameters:
+            old_score (int): The score of the record to replace.
+            record (dict<str, *>): The record to replace it with.
+
+        Raises:
+            ValueError: If no record has the old score.
+        """
+        heap = self._heap
+        matches = [index for index, (score, _, _) in enumerate(heap)
+                   if score == old_score]
+        if not matches:
+            raise ValueError("{} is not a recorded score".format(old_score))
+
+        index = min(matches, key=lambda index: heap[index][1])
+        heap[index] = (record["score"], heap[index][1], record)
+        heapq.heapify(heap)
+        self._changed()
+
+    def get_records(self):
+        """(list<dict<str, *>>) Returns the records, oldest first. The list is
+        shared until the next change, so must not be modified."""
+        if self._ordered is None:
+            self._ordered = [record for _, _, record in
+                             sorted(self._heap, key=lambda entry: entry[1])]
+        return self._ordered
+
+    def get_sorted_records(self):
+        """(list<dict<str, *>>) Returns the records, highest score first. The
+        list is shared until the next change, so must not be modified."""
+        if self._sorted is None:
+            self._sorted = [record for _, _, record in sorted(
+                self._heap, key=lambda entry: (-entry[0], entry[1]))]
+        return self._sorted
+
+    def __len__(self):
+        return len(self._heap)
+
 
 class HighScoreManager:
     """A HighScoreManager manages the recording of highscores achieved to
     a highscore file.
+
+    In write-ahead mode, changes are appended to a line-delimited log beside
+    the highscore file, instead of rewriting it. The log is replayed on top of
+    the highscore file when loading, & merged into it when compacting.
+    Appending, loading & compacting hold a lock on file + ".lock", so several
+    processes can record scores at once. Changes from a compaction that was
+    interrupted are replayed by the next load or compaction.
     """
-    _data = None
+    _board = None
 
     def __init__(self, file="highscores.json", gamemode='regular',
-                 auto_save=True, top_scores=10):
+                 auto_save=True, top_scores=10, write_ahead=False,
+                 compact_after=100, compact_grids=False):
         """Constructs a HighScoreManager using the provided json file.
 
         Parameters:
@@ -15,14 +192,38 @@ class HighScoreManager:
                         information.
             gamemode (str): The name of the gamemode to load highscores from.
             auto_save (bool): If true the manager saves the scores automatically
-                              when a record is added.
-            top_scores (int): The number of high scores to store to file.
+                              when a record is added. In write-ahead mode, the
+                              record is appended to the log instead.
+            top_scores (int): The number of high scores to store to file. Any
+                              extra records in the file are discarded when
+                              loading.
+            write_ahead (bool): If true, changes are appended to the log file,
+                                file + ".log".
+            compact_after (int): In write-ahead mode, the number of changes
+                                 this manager appends to the log before
+                                 compacting it. Never compacts automatically
+                                 if None.
+            compact_grids (bool): If true, recorded grids are stored as
+                                  compact text, encoded by
+                                  modules.grid_codec. Grids stored as lists
+                                  are encoded when the gamemode is next saved.
+                                  Grids in either format can be loaded by
+                                  AbstractGame.deserialize.
         """
         self._file = file
         self._top_scores = top_scores
         self._auto_save = auto_save
         self._gamemode = gamemode
 
+        self._write_ahead = write_ahead
+        self._compact_after = compact_after
+        self._log_file = file + ".log"
+        self._lock_file = file + ".lock"
+        self._pending = []
+        self._logged = 0
+
+        self._compact_grids = compact_grids
+
         if self._auto_save:
             self.load()
 
@@ -46,19 +247,210 @@ class HighScoreManager:
 
         return data
 
+    def _write_json(self, data):
+        """Replaces the highscore json file with data, atomically."""
+        directory, name = os.path.split(os.path.abspath(self._file))
+        descriptor, temporary = tempfile.mkstemp(dir=directory,
+                                                 prefix=name + ".",
+                                                 suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w") as file:
+                file.write(json.dumps(data, indent=2))
+            try:
+                shutil.copymode(self._file, temporary)
+            except FileNotFoundError:
+                pass
+            os.replace(temporary, self._file)
+        except BaseException:
+            os.remove(temporary)
+            raise
+
     def load(self):
         """Loads the highscore information from the highscores file into the
         manager.
         """
-        data = self._load_json()
-        self._data = data[self._gamemode]
+        if not self._write_ahead:
+            data = self._load_json()
+            self._board = Leaderboard(data[self._gamemode], self._top_scores)
+            return
+
+        with _FileLock(self._lock_file):
+            data = self._load_json()
+            entries = [entry for path in self._get_claimed_logs() +
+                       [self._log_file] for entry in self._read_log(path)]
+
+        self._board = Leaderboard(data[self._gamemode], self._top_scores)
+        for entry in entries:
+            if entry["gamemode"] == self._gamemode:
+                self._apply(self._board, entry, self._top_scores)
+
+        self._pending = []
 
     def save(self):
-        """Saves the information added to the highscore manager to the file."""
+        """Saves the information added to the highscore manager to the file.
+
+        In write-ahead mode, appends any changes to the log, then compacts it.
+        """
+        if self._write_ahead:
+            self._flush_log()
+            self.compact()
+            return
+
+        records = self.get_data()
+        if self._compact_grids:
+            records = [self._compact_record(record) for record in records]
+
         data = self._load_json()
-        with open(self._file, "w") as file:
-            data[self._gamemode] = self._data
-            file.write(json.dumps(data, indent=2))
+        data[self._gamemode] = records
+        self._write_json(data)
+
+    @staticmethod
+    def _compact_record(record):
+        """(dict<str, *>) Returns a record with its grid encoded as compact
+        text, if it is stored as a list."""
+        if grid_codec.is_encoded(record["grid"]):
+            return record
+        return dict(record, grid=grid_codec.dumps(record["grid"]))
+
+    def close(self):
+        """Saves the information added to the highscore manager to the file.
+        Call when shutting down."""
+        self.save()
+
+    def compact(self):
+        """Merges the log into the highscores file, for every gamemode.
+
+        The log is claimed by renaming it, then merged along with any claimed
+        logs left by compactions that were interrupted. Blocks while another
+        process is appending to, loading or compacting the log.
+        """
+        if not self._write_ahead:
+            return
+
+        with _FileLock(self._lock_file):
+            # Claimed under a new name, so a claim left by a compaction which
+            # failed is never written over
+            directory, name = os.path.split(os.path.abspath(self._log_file))
+            descriptor, claimed = tempfile.mkstemp(dir=directory,
+                                                   prefix=name + ".",
+                                                   suffix=".compacting")
+            os.close(descriptor)
+            try:
+                os.replace(self._log_file, claimed)
+            except FileNotFoundError:
+                os.remove(claimed)
+
+            paths = self._get_claimed_logs()
+            if paths:
+                data = self._load_json()
+                boards = {}
+                for path in paths:
+                    for entry in self._read_log(path):
+                        gamemode = entry["gamemode"]
+                        if gamemode not in boards:
+                            boards[gamemode] = Leaderboard(
+                                data.get(gamemode, []))
+                        self._apply(boards[gamemode], entry)
+
+                for gamemode, board in boards.items():
+                    data[gamemode] = board.get_records()
+                self._write_json(data)
+
+                for path in paths:
+                    os.remove(path)
+
+        self._logged = 0
+
+    def _get_claimed_logs(self):
+        """(list<str>) Returns the names of the logs claimed for compaction,
+        oldest first. Unless called by a compaction, these were left by
+        compactions that were interrupted."""
+        pattern = glob.escape(self._log_file) + ".*.compacting"
+        return sorted(glob.glob(pattern),
+                      key=lambda path: (os.path.getmtime(path), path))
+
+    @staticmethod
+    def _read_log(path):
+        """Yields each change in a log file, skipping any partially written
+        lines.
+
+        Parameters:
+            path (str): The name of the log file.
+
+        Yield:
+            dict<str, *>: The change.
+        """
+        try:
+            with open(path) as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+    def _log(self, entry):
+        """Adds a change to be appended to the log, in write-ahead mode.
+
+        Parameters:
+            entry (dict<str, *>): The change.
+        """
+        if not self._write_ahead:
+            return
+
+        entry["gamemode"] = self._gamemode
+        self._pending.append(entry)
+
+    def _flush_log(self):
+        """Appends pending changes to the log, compacting it once this manager
+        has appended enough changes."""
+        if not self._pending:
+            return
+
+        # A single write, so that lines from concurrent writers never mix
+        lines = "".join(json.dumps(entry, separators=(',', ':')) + "\n"
+                        for entry in self._pending)
+        with _FileLock(self._lock_file):
+            with open(self._log_file, "a") as file:
+                file.write(lines)
+
+        self._logged += len(self._pending)
+        self._pending = []
+
+        if (self._compact_after is not None and
+                self._logged >= self._compact_after):
+            self.compact()
+
+    @staticmethod
+    def _apply(board, entry, top_scores=None):
+        """Applies a change from the log to a leaderboard.
+
+        A replacement whose old score is no longer recorded, e.g. because it
+        was since pushed out of the top scores, is added as a new record.
+
+        Parameters:
+            board (Leaderboard): The leaderboard of the change's gamemode.
+            entry (dict<str, *>): The change.
+            top_scores (int): The number of records to keep, if less than the
+                              number kept when the change was made.
+        """
+        top = entry.get("top")
+        if top is None:
+            top = len(board) + 1
+        if top_scores is not None:
+            top = min(top, top_scores)
+
+        if entry["op"] == "replace":
+            try:
+                board.replace(entry["old_score"], entry["record"])
+                return
+            except ValueError:
+                pass
+
+        board.insert(entry["record"], top)
 
     def record(self, score, grid, name=None):
         """Makes a record of a gameplay based on the score, final grid and name.
@@ -68,16 +460,20 @@ class HighScoreManager:
             grid (LoloGrid): A grid to be serialized into the file.
             name (str): The name of the player who played the recorded game.
         """
-        scores = self.get_scores()
-        data = {"score": score, "name": str(name), "grid": grid.serialize()}
+        grid = grid.serialize()
+        if self._compact_grids:
+            grid = grid_codec.dumps(grid)
+
+        data = {"score": score, "name": str(name), "grid": grid}
 
-        if len(scores) < self._top_scores:
-            self._data.append(data)
-        elif score > min(scores):
-            self.replace_record(min(scores), data)
+        self._board.insert(data, self._top_scores)
+        self._log({"op": "record", "top": self._top_scores, "record": data})
 
         if self._auto_save:
-            self.save()
+            if self._write_ahead:
+                self._flush_log()
+            else:
+                self.save()
 
     def replace_record(self, old_score, new_data):
         """Replaces a record based by finding the old score
@@ -86,8 +482,9 @@ class HighScoreManager:
             old_score (int): The score of the record to replace.
             new_data (dict<str, *>): The record to replace the old record with.
         """
-        min_score_index = self.get_scores().index(old_score)
-        self._data[min_score_index] = new_data
+        self._board.replace(old_score, new_data)
+        self._log({"op": "replace", "old_score": old_score,
+                   "top": self._top_scores, "record": new_data})
 
     def __iter__(self):
         """Loop through each record in the highscores file.
@@ -99,25 +496,321 @@ class HighScoreManager:
             yield record
 
     def __len__(self):
-        return len(self.get_data())
+        return len(self._board)
+
+    def get_top_scores(self):
+        """(int) Returns the number of high scores stored."""
+        return self._top_scores
+
+    def set_top_scores(self, top_scores):
+        """Sets the number of high scores stored, discarding the lowest
+        scoring records beyond it.
+
+        Parameters:
+            top_scores (int): The number of high scores to store to file.
+        """
+        self._top_scores = top_scores
+        self._board.trim(top_scores)
 
     def get_data(self):
         """(list<dict<str, *>>) Returns a list of all the records in the file"""
-        return self._data
+        return self._board.get_records()
 
     def get_sorted_data(self):
         """(list<dict<str, *>>) Returns a sorted list of records in the file."""
-        return sorted(self._data, key=lambda x: -x["score"])
+        return self._board.get_sorted_records()
+
+    def get_headers(self):
+        """(list<tuple<str, int>>) Returns the (name, score) of each record,
+        highest score first. Grids stored as compact text are not decoded, but
+        grids stored as lists have already been parsed along with the rest of
+        the file by load."""
+        return [(record["name"], record["score"])
+                for record in self.get_sorted_data()]
+
+    def get_grid(self, index):
+        """Returns the grid of a record, decoding it if it is stored as compact
+        text.
+
+        Parameters:
+            index (int): The index of the record in get_headers.
+
+        Raises:
+            IndexError: If there is no record at index.
+
+        Return:
+            list<list<tuple<int, int>>>: The serialized grid.
+        """
+        grid = self.get_sorted_data()[index]["grid"]
+        if grid_codec.is_encoded(grid):
+            grid = grid_codec.loads(grid)
+        return grid
+
+    def get_scores(self):
+        """(list<int>) Returns a list of all the scores in the file."""
+        return [player['score'] for player in self.get_data()]
+
+    def get_names(self):
+        """(list<str>) Returns a list of all the scores in the file."""
+        return [player['name'] for player in self.get_data()]
+
+    def get_grids(self):
+        """(list<list<list<tuple<int, int>>>>) Returns a list of all the scores
+                                               in the file."""
+        return [player['grid'] for player in self.get_data()]
+
+
+class SQLiteHighScoreManager:
+    """A SQLiteHighScoreManager manages the recording of highscores achieved
+    to a SQLite database, with the same interface as HighScoreManager.
+
+    Records are indexed by gamemode & score, so recording a score writes a
+    single row, rather than rewriting every record. Grids are stored as blobs,
+    encoded by modules.grid_codec.
+
+    Records are kept & ordered exactly as by HighScoreManager. A row's id
+    gives its place in the order of records, so a record which pushes out the
+    lowest score is written over its row, taking its place.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            gamemode TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            grid BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scores_gamemode_score
+            ON scores (gamemode, score);
+    """
+
+    def __init__(self, file="highscores.db", gamemode='regular',
+                 auto_save=True, top_scores=10):
+        """Constructs a SQLiteHighScoreManager using the provided database file.
+
+        Parameters:
+            file (str): The name of the SQLite database which stores the
+                        highscore information.
+            gamemode (str): The name of the gamemode to load highscores from.
+            auto_save (bool): If true each record is committed to the database
+                              as it is added. Otherwise, records are
+                              committed on save.
+            top_scores (int): The number of high scores to store to file.
+        """
+        self._file = file
+        self._top_scores = top_scores
+        self._auto_save = auto_save
+        self._gamemode = gamemode
+
+        self._connection = sqlite3.connect(file)
+        self._connection.executescript(self._SCHEMA)
+        self._trim()
+
+    def load(self):
+        """Discards any records that have not been saved. Saved records are
+        read from the database as they are needed. Any records beyond the top
+        scores are discarded, as by HighScoreManager.
+        """
+        self._connection.rollback()
+        self._trim()
+
+    def save(self):
+        """Commits the records added to the highscore manager to the database."""
+        self._connection.commit()
+
+    def close(self):
+        """Saves the records & closes the database."""
+        self.save()
+        self._connection.close()
+
+    @staticmethod
+    def _encode_grid(grid):
+        """(bytes) Returns the blob stored for a serialized grid, either as a
+        list or compact text."""
+        if grid_codec.is_encoded(grid):
+            grid = grid_codec.loads(grid)
+        return grid_codec.encode(grid)
+
+    @staticmethod
+    def _decode_grid(blob):
+        """(list<list<tuple<int, int>>>) Returns the serialized grid stored in
+        a blob."""
+        return grid_codec.decode(blob)
+
+    def _query(self, columns, order="id"):
+        """Returns the given columns of every record in the gamemode.
+
+        Parameters:
+            columns (str): The columns to select, separated by commas.
+            order (str): The ordering of the records.
+
+        Return:
+            list<tuple>: The rows.
+        """
+        return self._connection.execute(
+            "SELECT {} FROM scores WHERE gamemode = ? ORDER BY {}".format(
+                columns, order), (self._gamemode,)).fetchall()
+
+    def _to_record(self, row):
+        """(dict<str, *>) Returns the record for a (score, name, grid) row."""
+        score, name, grid = row
+        return {"score": score, "name": name, "grid": self._decode_grid(grid)}
+
+    def record(self, score, grid, name=None):
+        """Makes a record of a gameplay based on the score, final grid and name.
+
+        The record is only kept if it is among the top scores. Of records with
+        equal scores, the oldest is listed first, but pushed out first.
+
+        Parameters:
+            score (int): The top score of the gameplay.
+            grid (LoloGrid): A grid to be serialized into the file.
+            name (str): The name of the player who played the recorded game.
+        """
+        row = (self._gamemode, score, str(name),
+               self._encode_grid(grid.serialize()))
+
+        if self._auto_save:
+            with self._connection:
+                self._insert(row)
+        else:
+            self._insert(row)
+
+    def _insert(self, row):
+        """Adds a (gamemode, score, name, grid) row if it is among the top
+        scores, as Leaderboard.insert."""
+        self._trim()
+
+        if len(self) < self._top_scores:
+            self._connection.execute(
+                "INSERT INTO scores (gamemode, score, name, grid) "
+                "VALUES (?, ?, ?, ?)", row)
+            return
+
+        # The lowest score, the oldest of any ties, is pushed out
+        lowest = self._connection.execute(
+            "SELECT id, score FROM scores WHERE gamemode = ? "
+            "ORDER BY score, id LIMIT 1", (self._gamemode,)).fetchone()
+
+        gamemode, score, name, grid = row
+        if lowest is not None and score > lowest[1]:
+            self._connection.execute(
+                "UPDATE scores SET score = ?, name = ?, grid = ? WHERE id = ?",
+                (score, name, grid, lowest[0]))
+
+    def _trim(self):
+        """Removes the lowest scoring records beyond the top scores, the
+        oldest of any ties first, as Leaderboard.trim."""
+        self._connection.execute(
+            "DELETE FROM scores WHERE id IN ("
+            "SELECT id FROM scores WHERE gamemode = ? "
+            "ORDER BY score DESC, id DESC LIMIT -1 OFFSET ?)",
+            (self._gamemode, self._top_scores))
+
+    def replace_record(self, old_score, new_data):
+        """Replaces a record based by finding the old score
+
+        Parameters:
+            old_score (int): The score of the record to replace.
+            new_data (dict<str, *>): The record to replace the old record with.
+        """
+        cursor = self._connection.execute(
+            "UPDATE scores SET score = ?, name = ?, grid = ? WHERE id = ("
+            "SELECT id FROM scores WHERE gamemode = ? AND score = ? "
+            "ORDER BY id LIMIT 1)",
+            (new_data["score"], str(new_data["name"]),
+             self._encode_grid(new_data["grid"]), self._gamemode, old_score))
+
+        if not cursor.rowcount:
+            raise ValueError("{} is not a recorded score".format(old_score))
+
+        if self._auto_save:
+            self.save()
+
+    def __iter__(self):
+        """Loop through each record in the highscores file.
+
+        Yield:
+            record (dict<str, int>): The record being yielded
+        """
+        for record in self.get_sorted_data():
+            yield record
+
+    def __len__(self):
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM scores WHERE gamemode = ?",
+            (self._gamemode,)).fetchone()[0]
+
+    def get_top_scores(self):
+        """(int) Returns the number of high scores stored."""
+        return self._top_scores
+
+    def set_top_scores(self, top_scores):
+        """Sets the number of high scores stored, discarding the lowest
+        scoring records beyond it.
+
+        Parameters:
+            top_scores (int): The number of high scores to store to file.
+        """
+        self._top_scores = top_scores
+        if self._auto_save:
+            with self._connection:
+                self._trim()
+        else:
+            self._trim()
+
+    def get_data(self):
+        """(list<dict<str, *>>) Returns a list of all the records in the file"""
+        return [self._to_record(row)
+                for row in self._query("score, name, grid")]
+
+    def get_sorted_data(self):
+        """(list<dict<str, *>>) Returns a sorted list of records in the file."""
+        return [self._to_record(row) for row in
+                self._query("score, name, grid", order="score DESC, id")]
+
+    def get_headers(self):
+        """(list<tuple<str, int>>) Returns the (name, score) of each record,
+        highest score first, without reading any grids."""
+        return self._query("name, score", order="score DESC, id")
+
+    def get_grid(self, index):
+        """Returns the grid of a record.
+
+        Parameters:
+            index (int): The index of the record in get_headers.
+
+        Raises:
+            IndexError: If there is no record at index.
+
+        Return:
+            list<list<tuple<int, int>>>: The serialized grid.
+        """
+        if index < 0:
+            index += len(self)
+
+        row = None
+        if index >= 0:
+            row = self._connection.execute(
+                "SELECT grid FROM scores WHERE gamemode = ? "
+                "ORDER BY score DESC, id LIMIT 1 OFFSET ?",
+                (self._gamemode, index)).fetchone()
+
+        if row is None:
+            raise IndexError("No record at index {}".format(index))
+
+        return self._decode_grid(row[0])
 
     def get_scores(self):
         """(list<int>) Returns a list of all the scores in the file."""
-        return [player['score'] for player in self._data]
+        return [score for score, in self._query("score")]
 
     def get_names(self):
         """(list<str>) Returns a list of all the scores in the file."""
-        return [player['name'] for player in self._data]
+        return [name for name, in self._query("name")]
 
     def get_grids(self):
         """(list<list<list<tuple<int, int>>>>) Returns a list of all the scores
                                                in the file."""
-        return [player['grid'] for player in self._data]
+        return [self._decode_grid(grid) for grid, in self._query("grid")]
@@ -1,8 +1,13 @@
 """Abstract modelling classes for Lolo puzzle game."""
 
 # To understand recursion, see the bottom of this file
+import collections
+import copy
 import itertools
+import operator
+import random
 
+from modules import grid_codec
 from modules import matrix as matrix
 from modules.ee import EventEmitter
 
@@ -14,6 +19,8 @@ __version__ = "1.1.2"
 class AbstractTile:
     """Basic form of a Lolo tile."""
 
+    __slots__ = ('_type', '_value', '_disabled')
+
     def __init__(self, type, value=1):
         """Constructor
 
@@ -56,6 +63,11 @@ class AbstractTile:
         """Disables this tile."""
         self._disabled = True
 
+    def copy(self):
+        """(AbstractTile) Returns a copy of this tile, which can be changed
+        without affecting this tile."""
+        return copy.copy(self)
+
     def __repr__(self):
         return "{}({!r}, {!r})".format(self.__class__.__name__, self._type,
                                        self._value)
@@ -75,6 +87,40 @@ class AbstractTileGenerator:
         """
         raise NotImplementedError
 
+    def generate_many(self, positions):
+        """Returns a new tile for each position.
+
+        Parameters:
+            positions (list<tuple<int, int>>): The (row, column) positions of
+                                               the tiles.
+
+        Return:
+            list<AbstractTile>: The new tiles, in order of positions.
+        """
+        return [self.generate(position) for position in positions]
+
+    def prefetch(self):
+        """Prepares upcoming tiles ahead of time, if supported. Called when the
+        game is idle."""
+
+    def get_state(self):
+        """Returns any state of this generator which decides the tiles it
+        generates next, other than its random number generator's, such as
+        tiles prepared ahead of time.
+
+        Return:
+            list<*>: The state, which only contains lists, strings, numbers &
+                     None, or None if there is no such state.
+        """
+        return None
+
+    def set_state(self, state):
+        """Sets the state returned by a generator's get_state.
+
+        Parameters:
+            state (list<*>): The state, or None.
+        """
+
 
 class LoloGrid(matrix.Matrix):
     """Generic Lolo game."""
@@ -94,19 +140,38 @@ class LoloGrid(matrix.Matrix):
 
         Preconditions:
             connected is reflexive (connected(a, b) == connected(b, a))
+            connected is transitive (connected(a, b) and connected(b, c)
+                                     implies connected(a, c))
         """
         super().__init__(rows, columns, default)
 
         self._animation = animation
         self._generator = tile_generator
-        self._connected = lambda tile, neighbour: tile == neighbour
+        self._connected = connected if connected is not None else operator.eq
+
+        # Drop distances from the most recent replacement of blank tiles
+        self._drops = {}
+
+        # Incremented on every change to the grid's cells
+        self._version = 0
+
+        # Component labelling, maintained lazily across mutations
+        self._labels = None
+        self._components = {}
+        self._sizes = {}
+        self._next_label = 0
+        self._dirty = set()
+
+        # Previous values of the cells changed since the journal was started
+        self._journal = None
 
     def fill(self):
         """Fills all empty cells with newly generated tiles."""
-        for position in self:
-            if self[position] is None:
-                tile = self.generate_tile(position)
-                self[position] = tile
+        positions = [position for position, tile in self.items()
+                     if tile is None]
+
+        for position, tile in zip(positions, self.generate_tiles(positions)):
+            self[position] = tile
 
     # TODO: these should be on game :/
     # Move on and call me an idiot later.
@@ -160,7 +225,7 @@ class LoloGrid(matrix.Matrix):
 
         # Default to all cells
         if not positions:
-            positions = set(self)
+            positions = None
 
         # Perform depth first search on matrix.
         # Treat adjacent cells as having edge iff they share the same type.
@@ -168,6 +233,9 @@ class LoloGrid(matrix.Matrix):
         # Initialize data structures
         nodes = []
         visited = set()
+        neighbours = self.get_neighbour_table()
+        connected = self._connected
+        root_tile = self[root]
 
         nodes.append(root)
 
@@ -178,17 +246,25 @@ class LoloGrid(matrix.Matrix):
                 visited.add(node)
 
                 # Iterate over adjacent nodes
-                for adjacent in self.get_adjacent_cells(node):
+                for adjacent in neighbours[node]:
 
-                    if adjacent not in positions:
+                    if positions is not None and adjacent not in positions:
                         continue
 
                     # Ensure the type matches
-                    if self._connected(self[root], self[adjacent]):
+                    if connected(root_tile, self[adjacent]):
                         nodes.append(adjacent)
 
         return visited
 
+    def set_generator(self, tile_generator):
+        """Sets the tile generator used to generate new tiles.
+
+        Parameters:
+            tile_generator (AbstractTileGenerator): The tile generator.
+        """
+        self._generator = tile_generator
+
     def generate_tile(self, position):
         """Uses the provided tile generator to generate a tile for a position."""
         return self._generator.generate(position)
@@ -199,25 +275,325 @@ class LoloGrid(matrix.Matrix):
         Yield:
             set<tuple<int, int>>: A set of (row, column) positions for each connected tile, including root.
         """
-        positions = set(self)
+        self._update_components()
 
-        while len(positions):
-            node = positions.pop()
+        for group in list(self._components.values()):
+            yield set(group)
 
-            connected = self.find_connected(node, positions)
+    def label_components(self):
+        """Labels every connected component within the grid. Empty cells are
+        never connected.
+
+        The labelling is maintained across mutations: only components touching
+        cells changed since the previous call are relabelled.
+
+        Return:
+            tuple<dict<tuple<int, int>, int>, dict<int, int>>:
+                (labels, sizes) pair, where labels maps each (row, column)
+                position to the id of its component and sizes maps each id to
+                the number of cells in that component. Both are owned by the
+                grid and must not be modified.
+        """
+        self._update_components()
+        return self._labels, self._sizes
+
+    def get_components(self):
+        """(dict<int, set<tuple<int, int>>>) Returns a map of each component id
+        to the positions in that component. Owned by the grid and must not be
+        modified."""
+        self._update_components()
+        return self._components
+
+    def has_group(self, size):
+        """Returns True iff any connected group has at least size cells.
+
+        Answered from the component labelling when it is up to date. Otherwise,
+        groups of two are found by comparing each cell with its left & upper
+        neighbours, and larger groups by a search which stops as soon as a
+        group reaches the given size.
+
+        Parameters:
+            size (int): The minimum number of cells in a group.
 
-            if not connected:
+        Return:
+            bool
+        """
+        if self._labels is not None and not self._dirty:
+            return any(count >= size for count in self._sizes.values())
+
+        connected = self._connected
+
+        if size <= 1:
+            return any(value is not None for _, value in self.items())
+
+        if size == 2:
+            above = None
+            for values in self._scan_rows():
+                left = None
+                for column, value in enumerate(values):
+                    if value is not None:
+                        if left is not None and connected(value, left):
+                            return True
+                        if above is not None:
+                            up = above[column]
+                            if up is not None and connected(value, up):
+                                return True
+                    left = value
+                above = values
+            return False
+
+        neighbours = self.get_neighbour_table()
+        visited = set()
+        for root, tile in self.items():
+            if tile is None or root in visited:
                 continue
 
-            for cell in connected:
-                if cell in positions:
-                    positions.remove(cell)
+            visited.add(root)
+            count = 1
+            nodes = [root]
+            while nodes:
+                node = nodes.pop()
+                for adjacent in neighbours[node]:
+                    if adjacent in visited:
+                        continue
+
+                    other = self[adjacent]
+                    if other is not None and connected(tile, other):
+                        count += 1
+                        if count >= size:
+                            return True
+                        visited.add(adjacent)
+                        nodes.append(adjacent)
+
+        return False
+
+    def _scan_rows(self):
+        """(iterable(list<*>)) Returns the values in each row, to be read but
+        not changed."""
+        return self.get_rows()
+
+    def mark_dirty(self, *positions):
+        """Marks cells as changed, for tiles that were modified in place.
+
+        Parameters:
+            *positions (tuple<int, int>): The positions of the changed cells.
+        """
+        self._version += 1
+        if self._labels is not None:
+            self._dirty.update(positions)
+
+    def get_version(self):
+        """(int) Returns a number which changes whenever the grid changes."""
+        return self._version
+
+    def start_journal(self):
+        """Starts recording the changes made to cells."""
+        self._journal = {}
+
+    def stop_journal(self):
+        """Stops recording the changes made to cells.
+
+        Return:
+            tuple<tuple<tuple<int, int>, *, *>, ...>:
+                The (position, before, after) values of each cell changed
+                since the journal was started.
+        """
+        journal = self._journal
+        self._journal = None
+        return tuple((position, before, self[position])
+                     for position, before in journal.items()
+                     if self[position] is not before)
+
+    def __setitem__(self, position, value):
+        journal = self._journal
+        if journal is not None and position not in journal:
+            journal[position] = self[position]
+
+        super().__setitem__(position, value)
+        self._version += 1
+        if self._labels is not None:
+            self._dirty.add(position)
+
+    def __delitem__(self, key):
+        journal = self._journal
+        if journal is not None and key not in journal:
+            journal[key] = self[key]
+
+        super().__delitem__(key)
+        self._version += 1
+        if self._labels is not None:
+            self._dirty.add(key)
+
+    def set_index(self, index, value):
+        """Sets the value at a linear (row-major) index, tracking the change
+        like any other assignment.
+
+        Parameters:
+            index (int): A valid linear index.
+            value (*): The new value.
+        """
+        self[self.position(index)] = value
+
+    def reset(self):
+        """Resets all cells to the default."""
+        super().reset()
+        self._version += 1
+        self._labels = None
+
+    def restore(self, snapshot):
+        """Sets every cell to those of a snapshot.
+
+        Parameters:
+            snapshot (*): A snapshot returned by this grid's snapshot method.
+        """
+        super().restore(snapshot)
+        self._version += 1
+        self._labels = None
+        self._drops = {}
+
+    def clone(self):
+        """Returns a copy of this grid, sharing its tiles & generator.
+
+        Tiles must be replaced, rather than changed in place, for the copies to
+        remain independent.
+
+        Return:
+            LoloGrid: The copy.
+        """
+        grid = copy.copy(self)
+        grid._dirty = set()
+        grid._journal = None
+        grid.restore(self.snapshot())
+        return grid
+
+    def _update_components(self):
+        """Brings the component labelling up to date with the grid."""
+        if self._labels is None or len(self._dirty) * 4 > len(self._labels):
+            self._label_all()
+        elif self._dirty:
+            self._relabel(self._dirty)
+
+        self._dirty = set()
 
-            yield connected
+    def _relabel(self, dirty):
+        """Relabels the components containing or adjacent to dirty cells.
+
+        Any component which could have gained or lost cells touches a dirty
+        cell, so every other component is left as is.
+
+        Parameters:
+            dirty (set<tuple<int, int>>): The positions of the changed cells.
+        """
+        labels = self._labels
+        components = self._components
+        sizes = self._sizes
+        neighbours = self.get_neighbour_table()
+        connected = self._connected
+
+        affected = set()
+        for position in dirty:
+            affected.add(labels[position])
+            for neighbour in neighbours[position]:
+                affected.add(labels[neighbour])
+
+        region = set()
+        for label in affected:
+            region |= components.pop(label)
+            del sizes[label]
+
+        while region:
+            root = region.pop()
+            root_tile = self[root]
+
+            label = self._next_label
+            self._next_label += 1
+
+            members = {root}
+            labels[root] = label
+
+            if root_tile is not None:
+                nodes = [root]
+                while nodes:
+                    node = nodes.pop()
+                    for adjacent in neighbours[node]:
+                        if adjacent not in region:
+                            continue
+
+                        tile = self[adjacent]
+                        if tile is not None and connected(root_tile, tile):
+                            region.remove(adjacent)
+                            members.add(adjacent)
+                            labels[adjacent] = label
+                            nodes.append(adjacent)
+
+            components[label] = members
+            sizes[label] = len(members)
+
+    def _label_all(self):
+        """Labels every component within the grid in a single raster scan,
+        joining each cell to its left & upper neighbours in a disjoint-set
+        forest."""
+        rows, columns = self._dim
+        connected = self._connected
+        parent = list(range(rows * columns))
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = index = parent[parent[index]]
+            return index
+
+        def union(a, b):
+            a, b = find(a), find(b)
+            if a < b:
+                parent[b] = a
+            elif b < a:
+                parent[a] = b
+
+        index = 0
+        above = None
+        for values in self._scan_rows():
+            left = None
+            for column, value in enumerate(values):
+                if value is not None:
+                    if left is not None and connected(value, left):
+                        union(index, index - 1)
+                    if above is not None:
+                        up = above[column]
+                        if up is not None and connected(value, up):
+                            union(index, index - columns)
+                left = value
+                index += 1
+            above = values
+
+        labels = {}
+        components = {}
+        for index, position in enumerate(self):
+            root = find(index)
+            labels[position] = root
+            members = components.get(root)
+            if members is None:
+                components[root] = {position}
+            else:
+                members.add(position)
+
+        self._labels = labels
+        self._components = components
+        self._sizes = {label: len(members)
+                       for label, members in components.items()}
+        self._next_label = rows * columns
 
     def replace_blanks(self):
-        """Replaces any blank tiles in the grid and yields at each frame."""
+        """Replaces any blank tiles in the grid and yields at each frame.
+
+        Without animation, each column is compacted in a single pass instead of
+        one row per frame. Both modes generate tiles in the same order and
+        reach the same final state."""
         replacements = self.calculate_replacements()
+        self._drops = self.calculate_drops(replacements)
+
+        if not self._animation:
+            self._compact_columns(replacements)
+            return
 
         # Perform drops
         max_drops = max(r[0] for r in replacements)
@@ -246,6 +622,87 @@ class LoloGrid(matrix.Matrix):
                 new_tile = self.generate_tile(new_position)
                 self[new_position] = new_tile
 
+    def _compact_columns(self, replacements):
+        """Performs every drop in a single pass, then fills the emptied cells
+        with a batch of generated tiles.
+
+        Parameters:
+            replacements (list<tuple<int, int, list<int>>>):
+                The drops to perform, as returned by calculate_replacements.
+        """
+        slots = []
+
+        for empties, column, rows in replacements:
+            tiles = [tile for tile in (self[row, column] for row in rows)
+                     if tile is not None]
+
+            for row, tile in zip(rows, tiles):
+                if self[row, column] is not tile:
+                    self[row, column] = tile
+
+            slots.append((column, rows[-1], rows[len(tiles):]))
+
+        # Generate in the same order as the animated drops: one tile for each
+        # column segment per frame, each landing on top of the last
+        positions = []
+        targets = []
+        for i in range(max((empties for empties, _, _ in replacements),
+                           default=0)):
+            for column, top, free in slots:
+                if i < len(free):
+                    positions.append((top, column))
+                    targets.append((free[i], column))
+
+        for target, tile in zip(targets, self.generate_tiles(positions)):
+            self[target] = tile
+
+    def generate_tiles(self, positions):
+        """Uses the provided tile generator to generate a tile for each
+        position.
+
+        Parameters:
+            positions (list<tuple<int, int>>): The positions to generate for.
+
+        Return:
+            list<AbstractTile>: The generated tiles, in order of positions.
+        """
+        return self._generator.generate_many(positions)
+
+    def calculate_drops(self, replacements=None):
+        """Calculates how far each tile falls when blank tiles are replaced.
+
+        Tiles generated to fill a column segment start stacked above it.
+
+        Parameters:
+            replacements (list<tuple<int, int, list<int>>>):
+                The drops to perform, as returned by calculate_replacements.
+                Calculated if not given.
+
+        Return:
+            dict<tuple<int, int>, int>: Map of the (row, column) position each
+                                        falling tile lands in to the number of
+                                        rows it falls.
+        """
+        if replacements is None:
+            replacements = self.calculate_replacements()
+
+        drops = {}
+        for empties, column, rows in replacements:
+            sources = [row for row in rows if self[row, column] is not None]
+            sources.extend(rows[-1] - 1 - i for i in range(empties))
+
+            for target, source in zip(rows, sources):
+                if target != source:
+                    drops[target, column] = target - source
+
+        return drops
+
+    def get_drops(self):
+        """(dict<tuple<int, int>, int>) Returns how far each tile fell during
+        the most recent replacement of blank tiles, keyed by the position it
+        landed in. See calculate_drops."""
+        return self._drops
+
     def can_position_drop(self, position):
         """(bool) Returns true iff the tile can drop to the next position.
 
@@ -325,14 +782,119 @@ class LoloGrid(matrix.Matrix):
         return row - 1, column
 
 
+class FlatLoloGrid(LoloGrid, matrix.FlatMatrix):
+    """Generic Lolo game, stored in a single row-major list of cells.
+
+    The searches & scans made on every move read the cell list directly by
+    linear index, rather than through (row, column) positions."""
+
+    def _scan_rows(self):
+        cells, columns = self._cells, self._columns
+        return (cells[start:start + columns]
+                for start in range(0, len(cells), columns))
+
+    def find_connected(self, root, positions=None):
+        """Finds all cells connected to the one at given position.
+
+        Parameters:
+            root (tuple<int, int>): The (row, column) position of the root cell.
+            positions (set<tuple<int, int>>): The set of positions to search.
+
+        Return:
+            set<tuple<int, int>>: A set of (row, column) positions for each connected tile, including root.
+        """
+        cells, columns = self._cells, self._columns
+        neighbours = self.get_index_neighbour_table()
+        connected = self._connected
+        root_tile = self[root]
+
+        # Default to all cells
+        allowed = None
+        if positions:
+            allowed = {row * columns + column for row, column in positions}
+
+        nodes = [self.index(root)]
+        visited = set()
+
+        while nodes:
+            node = nodes.pop()
+
+            if node not in visited:
+                visited.add(node)
+
+                for adjacent in neighbours[node]:
+                    if allowed is not None and adjacent not in allowed:
+                        continue
+
+                    if connected(root_tile, cells[adjacent]):
+                        nodes.append(adjacent)
+
+        return {divmod(index, columns) for index in visited}
+
+    def calculate_replacements(self):
+        """Calculates the drops that need to occur to replace empty tiles.
+
+        Return:
+            (list<tuple<int, int, int>>): A list of the drops that need to occur
+                                          for a tile to be replaced. Specified
+                                          by a tuple (empties, column, rows).
+        """
+        rows, columns = self._dim
+        cells = self._cells
+
+        drops = []
+        drop = []
+
+        for column in range(columns):
+
+            empties = 0
+
+            for row in range(rows - 1, -1, -1):
+                index = row * columns + column
+
+                if cells[index] is None:
+                    empties += 1
+
+                # As can_position_drop, for the position above
+                if row:
+                    above = cells[index - columns]
+                    can_drop = above is None or not above.get_disabled()
+                else:
+                    can_drop = False
+
+                if not can_drop:
+                    if empties == 0:
+                        # ignore full rows
+                        continue
+
+                    drop.append(row)
+                    drops.append((empties, column, drop))
+
+                    empties = 0
+                    drop = []
+                elif empties:
+                    drop.append(row)
+
+        return drops
+
+
 class AbstractGame(EventEmitter):
     """Abstract base class for a game of Lolo with helpful functionality across
     multiple game modes."""
 
     GAME_NAME = "Abstract"
 
+    # The LoloGrid class used to store the game's tiles
+    GRID_CLASS = LoloGrid
+
+    # Default maximum number of moves kept to undo
+    HISTORY_MOVES = 100
+
+    # Default maximum number of changed cells kept to undo, across all moves
+    HISTORY_CELLS = 10000
+
     def __init__(self, size, generator, min_group, animation=True,
-                 autofill=True):
+                 autofill=True, rng=None):
         """Constructor
 
         Parameters:
@@ -342,11 +904,16 @@ class AbstractGame(EventEmitter):
                              be a group.
             animation (bool): Animation is enabled iff True.
             autofill (bool): Automatically fills the grid iff True.
+            rng (random.Random): The game's random number generator, which its
+                                 generator should draw from. Defaults to a new,
+                                 randomly seeded generator.
         """
         super().__init__()
+        self._rng = rng if rng is not None else random.Random()
+
         rows, columns = size
-        self.grid = LoloGrid(generator, rows=rows, columns=columns,
-                             animation=animation)
+        self.grid = self.GRID_CLASS(generator, rows=rows, columns=columns,
+                                    animation=animation)
         self.generator = generator
 
         # Basic properties
@@ -354,6 +921,15 @@ class AbstractGame(EventEmitter):
         self._animation = animation
         self._resolving = False
 
+        # Query results, memoised until the grid changes
+        self._cache = {}
+        self._cache_state = None
+
+        # Moves that can be undone & redone
+        self._history_limits = self.HISTORY_MOVES, self.HISTORY_CELLS
+        self._move_state = None
+        self.clear_history()
+
         if autofill:
             self.grid.fill()
 
@@ -367,19 +943,223 @@ class AbstractGame(EventEmitter):
         """(bool) Returns True iff the game is resolving a move."""
         return self._resolving
 
+    def get_rng(self):
+        """(random.Random) Returns the game's random number generator."""
+        return self._rng
+
+    def set_generator(self, generator):
+        """Sets the generator of new tiles for the grid.
+
+        Parameters:
+            generator (AbstractTileGenerator): Generates tiles for the grid.
+        """
+        self.generator = generator
+        self.grid.set_generator(generator)
+
+    def clone(self):
+        """Returns an independent copy of this game, for trying out moves.
+
+        The copy shares tiles with this game, but not cells, so either can be
+        played without affecting the other. Its random number generator starts
+        from the same state, so both generate the same tiles. Event listeners
+        & undo history are not copied.
+
+        Return:
+            AbstractGame: The copy.
+        """
+        game = copy.copy(self)
+        EventEmitter.__init__(game)
+
+        game._rng = random.Random()
+        game._rng.setstate(self._rng.getstate())
+
+        game.grid = self.grid.clone()
+        game._cache = {}
+        game._cache_state = None
+        game._move_state = None
+        game.clear_history()
+
+        game._setup_clone()
+        return game
+
+    def _setup_clone(self):
+        """Replaces any state of a newly cloned game that is still shared with
+        the original. Called by clone on the copy."""
+        self.grid.set_generator(self.generator)
+
+    def snapshot(self):
+        """Returns the state of this game, so that it can be restored later.
+
+        Only the grid's cells are copied, not the tiles in them.
+
+        Return:
+            tuple<*, dict<str, *>, tuple>: The grid snapshot, game state &
+                                           random number generator state.
+        """
+        return self.grid.snapshot(), self._get_state(), self._rng.getstate()
+
+    def restore(self, snapshot):
+        """Returns this game to the state of a snapshot. The same snapshot can
+        be restored any number of times.
+
+        Parameters:
+            snapshot (tuple): A snapshot returned by this game's snapshot
+                              method.
+        """
+        grid, state, rng = snapshot
+        self.grid.restore(grid)
+        self._set_state(state)
+        self._rng.setstate(rng)
+        self.clear_history()
+
+    def _get_state(self):
+        """Returns the state of this game outside of its grid & random number
+        generator. Also forms the rest of serialize_state.
+
+        Return:
+            dict<str, *>: The state. Only contains lists, strings, numbers &
+                          None, so it can be saved as json.
+        """
+        return {"score": getattr(self, '_score', None)}
+
+    def _set_state(self, state):
+        """Sets the state of this game outside of its grid & random number
+        generator.
+
+        Parameters:
+            state (dict<str, *>): A state returned by _get_state.
+        """
+        self.set_score(state["score"])
+
+    def set_history_limits(self, moves=None, cells=None):
+        """Sets the maximum size of the undo history, discarding the oldest
+        moves beyond it.
+
+        Parameters:
+            moves (int): The maximum number of moves. Unchanged if None. Moves
+                         are not recorded at all if 0.
+            cells (int): The maximum number of changed cells, across all moves.
+                         Unchanged if None.
+        """
+        max_moves, max_cells = self._history_limits
+        if moves is not None:
+            max_moves = moves
+        if cells is not None:
+            max_cells = cells
+
+        self._history_limits = max_moves, max_cells
+        self._trim_history()
+
+    def clear_history(self):
+        """Forgets every move that could be undone or redone."""
+        self._history = collections.deque()
+        self._history_cells = 0
+        self._undone = []
+
+    def can_undo(self):
+        """(bool) Returns True iff there is a move to undo."""
+        return bool(self._history) and not self._resolving
+
+    def can_redo(self):
+        """(bool) Returns True iff there is an undone move to redo."""
+        return bool(self._undone) and not self._resolving
+
+    def undo(self):
+        """Reverts the most recent move.
+
+        The random number generator is not reverted, so a move that is undone
+        & played again may generate different tiles. Redo restores the tiles
+        that were originally generated.
+
+        Raises:
+            IndexError: If there is no move to undo or the game is resolving.
+        """
+        if self._resolving:
+            raise IndexError("Game is resolving.")
+        if not self._history:
+            raise IndexError("No move to undo.")
+
+        move = self._history.pop()
+        changes, before, _ = move
+        self._history_cells -= len(changes)
+
+        grid = self.grid
+        for position, tile, _ in changes:
+            grid[position] = tile
+
+        self._set_state(before)
+        self._undone.append(move)
+
+    def redo(self):
+        """Plays the most recently undone move again.
+
+        Raises:
+            IndexError: If there is no move to redo or the game is resolving.
+        """
+        if self._resolving:
+            raise IndexError("Game is resolving.")
+        if not self._undone:
+            raise IndexError("No move to redo.")
+
+        move = self._undone.pop()
+        changes, _, after = move
+
+        grid = self.grid
+        for position, _, tile in changes:
+            grid[position] = tile
+
+        self._set_state(after)
+        self._push_history(move)
+
+    def _begin_move(self):
+        """Starts recording a move, so that it can be undone. Called before
+        the move changes the game."""
+        if self._history_limits[0]:
+            self._move_state = self._get_state()
+            self.grid.start_journal()
+
+    def _end_move(self):
+        """Finishes recording the current move. Called once the move has
+        finished changing the game."""
+        if self._move_state is None:
+            return
+
+        move = self.grid.stop_journal(), self._move_state, self._get_state()
+        self._move_state = None
+
+        self._undone = []
+        self._push_history(move)
+
+    def _push_history(self, move):
+        """Adds a move to the undo history.
+
+        Parameters:
+            move (tuple): The (changes, before, after) of the move, where
+                          changes are from the grid's journal & before/after
+                          are states from _get_state.
+        """
+        self._history.append(move)
+        self._history_cells += len(move[0])
+        self._trim_history()
+
+    def _trim_history(self):
+        """Discards the oldest moves until the history is within its limits."""
+        max_moves, max_cells = self._history_limits
+        history = self._history
+        while history and (len(history) > max_moves or
+                           self._history_cells > max_cells):
+            self._history_cells -= len(history.popleft()[0])
+
     def find_groups(self):
         """Yields all the valid groups within the grid. Groups are connected and
         must have at least 'self.min_group' members.
 
         Yield:
-            set<tuple<int, int>>: A set of (row, column) positions for each connected tile, including root.
+            frozenset<tuple<int, int>>: A set of (row, column) positions for each connected tile, including root.
         """
-
-        for group in self.grid.find_all_connected():
-            if len(group) < self.min_group:
-                continue
-
-            yield group
+        yield from self._memoise('groups', lambda: [
+            frozenset(group) for group in self.grid.find_all_connected()
+            if len(group) >= self.min_group])
 
     def find_group(self, position):
         """Returns the group containing the tile at position, or None if no such
@@ -390,9 +1170,9 @@ class AbstractGame(EventEmitter):
 
         Return:
             None: If tile is not part of a group.
-            set<tuple<int, int>>: A set of (row, column) positions for each connected tile, including root.
+            frozenset<tuple<int, int>>: A set of (row, column) positions for each connected tile, including root.
         """
-        group = self.grid.find_connected(position)
+        group = self._find_connected(position)
 
         if len(group) < self.min_group:
             return None
@@ -406,15 +1186,21 @@ class AbstractGame(EventEmitter):
             list<tuple<tuple<int, int>, *, tuple<int, int>>>:
                 Each tuple has form (position, cell_type, neighbour_position).
         """
+        return self._memoise('connections', self._find_connections)
+
+    def _find_connections(self):
+        """Computes the result of find_connections."""
         connections = []
-        for group in self.find_groups():
-            for position in group:
-                cell = self.grid[position]
-                for neighbour in filter(None,
-                                        self.grid.get_adjacent_cells(position)):
-                    if neighbour in group:
-                        connections.append(
-                            (position, cell.get_type(), neighbour))
+        neighbours = self.grid.get_neighbour_table()
+        labels, sizes = self.grid.label_components()
+        for position, label in labels.items():
+            if sizes[label] < self.min_group:
+                continue
+
+            cell = self.grid[position]
+            for neighbour in neighbours[position]:
+                if labels[neighbour] == label:
+                    connections.append((position, cell.get_type(), neighbour))
         return connections
 
     def _attempt_activate_collect(self, position):
@@ -429,19 +1215,53 @@ class AbstractGame(EventEmitter):
                         resolving.
 
         Return:
-            (set<tuple<int, int>>): Positions of all cells connected to cell at
-                                    position (including the cell itself).
+            (frozenset<tuple<int, int>>): Positions of all cells connected to
+                                          cell at position (including the cell
+                                          itself).
         """
         if self._resolving:
             raise IndexError("Game is resolving.")
 
-        connected_cells = self.grid.find_connected(position)
+        connected_cells = self._find_connected(position)
 
         if len(connected_cells) < self.min_group:
             raise IndexError("Tile at {} cannot be activated.".format(position))
 
         return connected_cells
 
+    def _find_connected(self, position):
+        """(frozenset<tuple<int, int>>) Returns all cells connected to the one
+        at position, including itself. The result is memoised for every cell
+        in the group."""
+        key = 'connected', position
+        connected = self._memoise(key, lambda: frozenset(
+            self.grid.find_connected(position)))
+
+        cache = self._cache
+        for cell in connected:
+            cache['connected', cell] = connected
+
+        return connected
+
+    def _memoise(self, key, compute):
+        """Returns the memoised value for key, calling compute to produce it if
+        the grid has changed since it was last computed.
+
+        Parameters:
+            key (*): The key identifying the query.
+            compute (function): Called with no arguments to compute the value.
+        """
+        state = self.grid, self.grid.get_version(), self.min_group
+        if self._cache_state != state:
+            self._cache = {}
+            self._cache_state = state
+
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = compute()
+            return value
+
     def activate(self, position):
         """Attempts to activate the tile at the given position.
 
@@ -472,17 +1292,15 @@ class AbstractGame(EventEmitter):
 
     def game_over(self):
         """(bool) Returns True iff the game is over."""
-        for connected in self.grid.find_all_connected():
-            if len(connected) < self.min_group:
-                continue
-            return False
-        return True
+        return self._memoise('game_over',
+                             lambda: not self.grid.has_group(self.min_group))
 
     def reset(self):
         """Resets the game."""
         self.grid.reset()
         self.grid.fill()
         self.set_score(self.get_default_score())
+        self.clear_history()
 
     @classmethod
     def get_name(cls):
@@ -524,12 +1342,16 @@ class AbstractGame(EventEmitter):
     # Ideally, they would consider not just the grid but the entire game (i.e. all of __init__'s parameters).
     # However, this would be a breaking change, so only de/serialization of the grid is supported.
     # This will be changed in 1.2.0 (post-due-date update)
-    def serialize(self):
+    def serialize(self, compact=False):
         """
         Serializes this game.
-        
+
+        Parameters:
+            compact (bool): If True, the grid is encoded as compact text by
+                            modules.grid_codec.
+
         Return: 
-            grid (list<list<tuple<int, int>>>): The serialized grid.
+            grid (list<list<tuple<int, int>>>|str): The serialized grid.
         """
         grid_list = []
         for row in self.grid.get_rows():
@@ -537,6 +1359,9 @@ class AbstractGame(EventEmitter):
             for tile in row:
                 row_list.append((tile.get_type(), tile.get_value()))
             grid_list.append(row_list)
+
+        if compact:
+            return grid_codec.dumps(grid_list)
         return grid_list
 
     @classmethod
@@ -545,10 +1370,13 @@ class AbstractGame(EventEmitter):
         Deserializes a game grid.
         
         Parameters: 
-            grid (list<list<tuple<int, int>>>): A serialized grid list to load.
+            grid (list<list<tuple<int, int>>>|str): A serialized grid list to
+                                                    load, or compact text.
             *args: Extra positional arguments for the tile.
             **kwargs: Extra keyword arguments for the tile.
         """
+        if grid_codec.is_encoded(grid):
+            grid = grid_codec.loads(grid)
 
         # TODO: This line should be included, but causes an error with the current design.
         #       Error occurs for games that assume tiles are generated (i.e. unlimited)
@@ -563,5 +1391,44 @@ class AbstractGame(EventEmitter):
 
         return game
 
+    def serialize_state(self):
+        """
+        Serializes the grid, random number generator state & the rest of the
+        state from _get_state of this game, so that it can be resumed exactly.
+
+        Return:
+            dict<str, *>: The serialized state. Only contains lists, strings,
+                          numbers & None, so it can be saved as json.
+        """
+        version, internal, gauss = self._rng.getstate()
+        state = self._get_state()
+        state["grid"] = self.serialize()
+        state["rng"] = [version, list(internal), gauss]
+        return state
+
+    @classmethod
+    def deserialize_state(cls, state, *args, **kwargs):
+        """
+        Deserializes a game from its serialized state.
+
+        Parameters:
+            state (dict<str, *>): The state returned from serialize_state.
+            *args: Extra positional arguments for the game.
+            **kwargs: Extra keyword arguments for the game.
+        """
+        game = cls.deserialize(state["grid"], *args, **kwargs)
+        game._load_state(state)
+        return game
+
+    def _load_state(self, state):
+        """Loads the non-grid parts of a serialized state into this game.
+
+        Parameters:
+            state (dict<str, *>): The state returned from serialize_state.
+        """
+        version, internal, gauss = state["rng"]
+        self._rng.setstate((version, tuple(internal), gauss))
+        self._set_state(state)
+
 
 # To understand recursion, see the top of this file
@@ -0,0 +1,240 @@
+"""
+Compact binary encoding of serialized Lolo grids.
+
+A serialized grid is a list of rows, each a list of (type, value) pairs, as
+returned by AbstractGame.serialize. Its encoding is:
+
+    format byte, rows, columns          (varints)
+    type table                          (count, then each tagged type)
+    type encoding byte, types           (runs of (length, table index), or a
+                                         table index byte per cell)
+    value encoding byte, values         (a byte or zigzag varint per cell)
+
+Cells are taken in row-major order. Types are run-length encoded when that is
+shorter, as on boards with large groups, & otherwise stored as one byte each.
+Values are usually small & non-negative, so are stored as one byte each when
+they all fit. Byte-per-cell encodings decode without a loop over varints.
+
+Encoded grids are embedded in text (e.g. json) as PREFIX + base64.
+"""
+import base64
+import itertools
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2017, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.0.0"
+
+# Version of the binary format, stored as its first byte
+FORMAT = 1
+
+# Marks an encoded grid embedded in text
+PREFIX = "lolo1:"
+
+# Tags for each kind of tile type in the type table
+_NONE, _INT, _STR = range(3)
+
+# Encodings of the types & values
+_VARINTS, _BYTES = range(2)
+
+
+def _write_varint(out, number):
+    """Appends a non-negative integer to a bytearray, 7 bits per byte."""
+    while number > 0x7F:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _read_varint(data, offset):
+    """(tuple<int, int>) Returns the integer at offset in data, & the offset
+    after it."""
+    number = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, offset
+        shift += 7
+
+
+def _zigzag(number):
+    """(int) Maps a signed integer to a non-negative one: 0, -1, 1, -2, ..."""
+    return number * 2 if number >= 0 else -number * 2 - 1
+
+
+def _unzigzag(number):
+    """(int) Inverts _zigzag."""
+    return number // 2 if number % 2 == 0 else -(number + 1) // 2
+
+
+def encode(grid):
+    """Encodes a serialized grid.
+
+    Parameters:
+        grid (list<list<tuple<*, int>>>): The serialized grid. Types must be
+                                          None, int or str.
+
+    Raises:
+        ValueError: If the grid contains a type or value that cannot be encoded.
+
+    Return:
+        bytes: The encoding.
+    """
+    rows = len(grid)
+    columns = len(grid[0]) if rows else 0
+    cells = [cell for row in grid for cell in row]
+    if len(cells) != rows * columns:
+        raise ValueError("Grid rows must have equal lengths.")
+
+    out = bytearray()
+    out.append(FORMAT)
+    _write_varint(out, rows)
+    _write_varint(out, columns)
+
+    # Type table, in order of first appearance
+    codes = {}
+    for type, *_ in cells:
+        if type not in codes:
+            codes[type] = len(codes)
+
+    _write_varint(out, len(codes))
+    for type in codes:
+        if type is None:
+            out.append(_NONE)
+        elif isinstance(type, int) and not isinstance(type, bool):
+            out.append(_INT)
+            _write_varint(out, _zigzag(type))
+        elif isinstance(type, str):
+            text = type.encode()
+            out.append(_STR)
+            _write_varint(out, len(text))
+            out += text
+        else:
+            raise ValueError("Cannot encode tile type {!r}.".format(type))
+
+    indices = [codes[type] for type, *_ in cells]
+    runs = bytearray()
+    for code, run in itertools.groupby(indices):
+        _write_varint(runs, sum(1 for _ in run))
+        _write_varint(runs, code)
+
+    if len(codes) <= 256 and len(indices) <= len(runs):
+        out.append(_BYTES)
+        out += bytes(indices)
+    else:
+        out.append(_VARINTS)
+        out += runs
+
+    values = [value for _, value in cells]
+    for value in values:
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError("Cannot encode tile value {!r}.".format(value))
+
+    if all(0 <= value < 256 for value in values):
+        out.append(_BYTES)
+        out += bytes(values)
+    else:
+        out.append(_VARINTS)
+        for value in values:
+            _write_varint(out, _zigzag(value))
+
+    return bytes(out)
+
+
+def decode(data):
+    """Decodes a grid encoded by encode.
+
+    Parameters:
+        data (bytes): The encoding.
+
+    Raises:
+        ValueError: If data is not a valid encoding.
+
+    Return:
+        list<list<tuple<*, int>>>: The serialized grid.
+    """
+    try:
+        if data[0] != FORMAT:
+            raise ValueError("Unknown grid format {}.".format(data[0]))
+
+        rows, offset = _read_varint(data, 1)
+        columns, offset = _read_varint(data, offset)
+
+        count, offset = _read_varint(data, offset)
+        table = []
+        for _ in range(count):
+            tag = data[offset]
+            offset += 1
+            if tag == _NONE:
+                table.append(None)
+            elif tag == _INT:
+                number, offset = _read_varint(data, offset)
+                table.append(_unzigzag(number))
+            elif tag == _STR:
+                length, offset = _read_varint(data, offset)
+                table.append(data[offset:offset + length].decode())
+                offset += length
+            else:
+                raise ValueError("Unknown type tag {}.".format(tag))
+
+        size = rows * columns
+        encoding = data[offset]
+        offset += 1
+        if encoding == _BYTES:
+            indices = data[offset:offset + size]
+            if len(indices) < size:
+                raise IndexError
+            types = [table[code] for code in indices]
+            offset += size
+        elif encoding == _VARINTS:
+            types = []
+            while len(types) < size:
+                length, offset = _read_varint(data, offset)
+                code, offset = _read_varint(data, offset)
+                types.extend(itertools.repeat(table[code], length))
+        else:
+            raise ValueError("Unknown type encoding {}.".format(encoding))
+
+        encoding = data[offset]
+        offset += 1
+        if encoding == _BYTES:
+            values = data[offset:offset + size]
+            if len(values) < size:
+                raise IndexError
+        elif encoding == _VARINTS:
+            values = []
+            for _ in range(size):
+                value, offset = _read_varint(data, offset)
+                values.append(_unzigzag(value))
+        else:
+            raise ValueError("Unknown value encoding {}.".format(encoding))
+    except IndexError:
+        raise ValueError("Truncated grid encoding.") from None
+
+    if not columns:
+        return [[] for _ in range(rows)]
+
+    cells = list(zip(types, values))
+    return [cells[start:start + columns]
+            for start in range(0, size, columns)]
+
+
+def dumps(grid):
+    """(str) Returns the encoding of a serialized grid, as text."""
+    return PREFIX + base64.b64encode(encode(grid)).decode('ascii')
+
+
+def loads(text):
+    """(list<list<tuple<*, int>>>) Decodes a serialized grid from text
+    returned by dumps."""
+    if not is_encoded(text):
+        raise ValueError("Not an encoded grid.")
+    return decode(base64.b64decode(text[len(PREFIX):]))
+
+
+def is_encoded(grid):
+    """(bool) Returns True iff grid is text returned by dumps, rather than a
+    serialized grid list."""
+    return isinstance(grid, str) and grid.startswith(PREFIX)
@@ -1,6 +1,7 @@
 """
 Two-dimensional matrix data structure.
 """
+import collections.abc
 import itertools
 
 __author__ = "Benjamin Martin"
@@ -43,6 +44,9 @@ class Matrix:
         self._default = default
         self._dim = rows, columns
 
+        # Neighbour tables, built lazily for each set of deltas
+        self._neighbours = {}
+
     def reset(self):
         """Resets all elements in this matrix to the default."""
         rows, columns = self._dim
@@ -50,6 +54,24 @@ class Matrix:
             for j in range(columns):
                 self._cells[i][j] = self._default
 
+    def snapshot(self):
+        """Returns a copy of every value in this matrix, which can be restored
+        later. The values themselves are not copied.
+
+        Return:
+            tuple<tuple<*, ...>, ...>: The values in each row.
+        """
+        return tuple(map(tuple, self._cells))
+
+    def restore(self, snapshot):
+        """Sets every value in this matrix to those of a snapshot. The same
+        snapshot can be restored any number of times.
+
+        Parameters:
+            snapshot (*): A snapshot returned by this matrix's snapshot method.
+        """
+        self._cells = list(map(list, snapshot))
+
     def size(self):
         """(tuple<int, int>) Returns the size of this matrix."""
         return self._dim
@@ -61,13 +83,9 @@ class Matrix:
             position (tuple<int, int>): A position to test.
 
         Return: bool"""
-        if not all(a <= b < c for a, b, c in
-                   zip(itertools.repeat(0, len(self._dim)), position,
-                       self._dim)):
-            # Coordinates out of range
-            return False
-
-        return True
+        rows, columns = self._dim
+        row, column = position
+        return 0 <= row < rows and 0 <= column < columns
 
     def __getitem__(self, position):
         """(*) Returns the value corresponding to the key.
@@ -120,7 +138,7 @@ class Matrix:
         yield from self._cells
 
     def get_adjacent_cells(self, position, deltas=AXIAL_DELTAS):
-        """Yields adjacent cells from a given position.
+        """Returns adjacent cells from a given position.
 
         Parameters:
             position (int, int): A position.
@@ -128,12 +146,292 @@ class Matrix:
                 Changes in position, each corresponding to an adjacent cell.
                 Defaults to AXIAL_DELTAS.
 
+        Return:
+            tuple<tuple<int, int>, ...>: Position of each adjacent cell.
+        """
+        neighbours = self.get_neighbour_table(deltas).get(position)
+
+        if neighbours is None:
+            # Position is not in the matrix; its neighbours may still be
+            return tuple(neighbour for neighbour in
+                         (tuple(a + b for a, b in zip(position, delta))
+                          for delta in deltas)
+                         if neighbour in self)
+
+        return neighbours
+
+    def get_neighbour_table(self, deltas=AXIAL_DELTAS):
+        """Returns the table of adjacent cells for every position, building it
+        on first use for the given deltas.
+
+        Parameters:
+            deltas (tuple(tuple<int, int>, ...)):
+                Changes in position, each corresponding to an adjacent cell.
+                Defaults to AXIAL_DELTAS.
+
+        Return:
+            dict<tuple<int, int>, tuple<tuple<int, int>, ...>>:
+                Map of each position to the positions of its adjacent cells.
+        """
+        if not isinstance(deltas, tuple):
+            deltas = tuple(tuple(delta) for delta in deltas)
+
+        table = self._neighbours.get(deltas)
+
+        if table is None:
+            rows, columns = self._dim
+            table = {}
+            for row, column in self:
+                table[row, column] = tuple(
+                    (row + dr, column + dc) for dr, dc in deltas
+                    if 0 <= row + dr < rows and 0 <= column + dc < columns)
+            self._neighbours[deltas] = table
+
+        return table
+
+    def index(self, position):
+        """(int) Returns the linear (row-major) index of a position.
+
+        Parameters:
+            position (tuple<int, int>): A valid position.
+        """
+        row, column = position
+        return row * self._dim[1] + column
+
+    def position(self, index):
+        """(tuple<int, int>) Returns the position of a linear (row-major) index.
+
+        Parameters:
+            index (int): A valid linear index.
+        """
+        return divmod(index, self._dim[1])
+
+    def get_index(self, index):
+        """(*) Returns the value at a linear (row-major) index.
+
+        Parameters:
+            index (int): A valid linear index.
+        """
+        return self[self.position(index)]
+
+    def set_index(self, index, value):
+        """Sets the value at a linear (row-major) index.
+
+        Parameters:
+            index (int): A valid linear index.
+            value (*): The new value.
+        """
+        self[self.position(index)] = value
+
+
+class FlatMatrix(Matrix):
+    """Matrix whose cells are stored in a single row-major list.
+
+    Positions are translated to a linear index (row * columns + column), which
+    makes (row, column) accesses slightly slower than Matrix's. Code which
+    works in linear indices instead, through get_index/set_index & the
+    neighbour tables of get_index_neighbour_table, skips the translation."""
+
+    def __init__(self, rows=1, columns=1, default=None):
+        """
+        Constructor
+
+        Parameters:-
+            rows (int): The number of rows.
+            columns (int): The number of columns.
+            default (*): The default value. Defaults to None.
+
+        Preconditions:
+            rows & columns are both > 0
+        """
+        self._cells = [default] * (rows * columns)
+        self._default = default
+        self._dim = rows, columns
+        self._columns = columns
+
+        # Neighbour tables, built lazily for each set of deltas
+        self._neighbours = {}
+
+    def reset(self):
+        """Resets all elements in this matrix to the default."""
+        self._cells[:] = itertools.repeat(self._default, len(self._cells))
+
+    def snapshot(self):
+        """Returns a copy of every value in this matrix, which can be restored
+        later. The values themselves are not copied.
+
+        Return:
+            tuple<*, ...>: The values in row-major order.
+        """
+        return tuple(self._cells)
+
+    def restore(self, snapshot):
+        """Sets every value in this matrix to those of a snapshot. The same
+        snapshot can be restored any number of times.
+
+        Parameters:
+            snapshot (*): A snapshot returned by this matrix's snapshot method.
+        """
+        self._cells = list(snapshot)
+
+    def __getitem__(self, position):
+        """(*) Returns the value corresponding to the key.
+
+        Parameters:
+             position (tuple<int, int>): A position."""
+        row, column = position
+        if not 0 <= column < self._columns:
+            raise IndexError("Column {} out of range.".format(column))
+        return self._cells[row * self._columns + column]
+
+    def __setitem__(self, position, value):
+        """Sets the value corresponding to the key.
+
+        Parameters:
+             position (tuple<int, int>): A position.
+             value (*): The new value."""
+        row, column = position
+        if not 0 <= column < self._columns:
+            raise IndexError("Column {} out of range.".format(column))
+        self._cells[row * self._columns + column] = value
+
+    def __delitem__(self, key):
+        """Deletes the key and corresponding value.
+
+        Parameters:
+             key (tuple<int, int>): A position."""
+        row, column = key
+        if not 0 <= column < self._columns:
+            raise IndexError("Column {} out of range.".format(column))
+        self._cells[row * self._columns + column] = None
+
+    def items(self):
+        """Yields (key, value) pairs for every cell, where key is the
+        (row, column) position.
+
+        Yield:
+            (tuple<int, int>, *): (position, value) pair.
+        """
+        yield from zip(self, self._cells)
+
+    def get_rows(self):
+        """Yields rows of values. Each row is a live view of this matrix, as
+        with the row lists yielded by Matrix.get_rows.
+
         Yield:
-            tuple<int, int>: Position of each adjacent cell.
+            FlatRow: Values in each row.
+        """
+        for row in range(self._dim[0]):
+            yield FlatRow(self, row)
+
+    def index(self, position):
+        """(int) Returns the linear (row-major) index of a position.
+
+        Parameters:
+            position (tuple<int, int>): A valid position.
+        """
+        row, column = position
+        return row * self._columns + column
+
+    def position(self, index):
+        """(tuple<int, int>) Returns the position of a linear (row-major) index.
+
+        Parameters:
+            index (int): A valid linear index.
+        """
+        return divmod(index, self._columns)
+
+    def get_index(self, index):
+        """(*) Returns the value at a linear (row-major) index.
+
+        Parameters:
+            index (int): A valid linear index.
         """
-        for delta in deltas:
-            neighbour = tuple(a + b for a, b in zip(position, delta))
+        return self._cells[index]
+
+    def get_index_neighbour_table(self, deltas=AXIAL_DELTAS):
+        """Returns the table of adjacent cells for every linear index, building
+        it on first use for the given deltas.
+
+        Parameters:
+            deltas (tuple(tuple<int, int>, ...)):
+                Changes in position, each corresponding to an adjacent cell.
+                Defaults to AXIAL_DELTAS.
+
+        Return:
+            list<tuple<int, ...>>: The linear indices of the cells adjacent to
+                                   each linear index.
+        """
+        if not isinstance(deltas, tuple):
+            deltas = tuple(tuple(delta) for delta in deltas)
+
+        key = 'index', deltas
+        table = self._neighbours.get(key)
+
+        if table is None:
+            index = self.index
+            positions = self.get_neighbour_table(deltas)
+            table = [tuple(index(neighbour) for neighbour in positions[cell])
+                     for cell in self]
+            self._neighbours[key] = table
+
+        return table
+
+    def set_index(self, index, value):
+        """Sets the value at a linear (row-major) index.
+
+        Parameters:
+            index (int): A valid linear index.
+            value (*): The new value.
+        """
+        self._cells[index] = value
+
+
+class FlatRow(collections.abc.Sequence):
+    """A live view of one row of a FlatMatrix. Values can be read & set by
+    column, as with the row lists of a Matrix."""
+
+    __slots__ = ('_matrix', '_start')
+
+    def __init__(self, matrix, row):
+        """
+        Constructor
+
+        Parameters:
+            matrix (FlatMatrix): The matrix.
+            row (int): A valid row of the matrix.
+        """
+        self._matrix = matrix
+        self._start = row * matrix._columns
+
+    def _index(self, column):
+        """(int) Returns the linear index of a column in this row, which may
+        be negative, as with a list."""
+        columns = self._matrix._columns
+        if not -columns <= column < columns:
+            raise IndexError("Column {} out of range.".format(column))
+        return self._start + column % columns
+
+    def __len__(self):
+        return self._matrix._columns
+
+    def __getitem__(self, column):
+        if isinstance(column, slice):
+            return [self[i] for i in range(*column.indices(len(self)))]
+        return self._matrix._cells[self._index(column)]
+
+    def __setitem__(self, column, value):
+        self._matrix._cells[self._index(column)] = value
+
+    def __iter__(self):
+        start = self._start
+        return itertools.islice(self._matrix._cells, start,
+                                start + self._matrix._columns)
+
+    def __eq__(self, other):
+        if not isinstance(other, (FlatRow, list)):
+            return NotImplemented
+        return list(self) == list(other)
 
-            # ensure cell is valid
-            if neighbour in self:
-                yield neighbour
+    def __repr__(self):
+        return "FlatRow({!r})".format(list(self))
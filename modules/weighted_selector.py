@@ -17,31 +17,44 @@ class WeightedSelector:
     """Provides random choice between multiple choices, according to their
     relative probability weights.
 
+    Two sampling methods are available. By default, a choice is found by binary
+    search over cumulative probabilities. In alias mode, a choice is found from
+    a table built with Vose's alias method, in constant time.
+
     Preconditions:
         Any probability weighting for a choice is non-negative.
 
     Time Complexity:
         Provided dictionary in/get/set runs in amortized O(1) time;
 
-        __setitem__ runs in O(1) time iff the (choice, weight) pair would not
-        result in a change.
+        update, __setitem__, & __delitem__ run in O(1) time. The sampling table
+        is rebuilt on the next choice after any change, in O(n) time, where n is
+        the total number of choices in the WeightedSelector.
 
-        update, __setitem__, & __delitem__ run in O(n) time, where n is the
-        total number of choices in the WeightedSelector.
+        choose runs in O(log n) time, or O(1) time in alias mode.
     """
 
-    def __init__(self, choices):
+    def __init__(self, choices, alias=False, rng=None):
         """
         Constructor
 
         Parameters:
             choices (dict<*, num>): Map of choices to probability weights.
+            alias (bool): If True, choices are sampled with the alias method.
+            rng (random.Random): The random number generator to draw from.
+                                 Defaults to the random module's shared
+                                 generator.
         """
 
+        self._alias = alias
+        self._rng = rng
+        self._random = rng.random if rng is not None else random.random
         self._p = []
         self._weights = {}
+        self._stale = True
+        self._version = 0
         self.update(choices)
-        
+
     def __setitem__(self, choice, weight):
         """Sets the weight corresponding to a given choice, unless doing so
         would result in no change."""
@@ -49,7 +62,8 @@ class WeightedSelector:
             return
 
         self._weights[choice] = weight
-        self._generate_p()
+        self._stale = True
+        self._version += 1
 
     def __delitem__(self, choice):
         """Deletes the weight corresponding to a given choice, unless choice
@@ -57,7 +71,8 @@ class WeightedSelector:
         if choice not in self._weights:
             return
         del self._weights[choice]
-        self._generate_p()
+        self._stale = True
+        self._version += 1
 
     def update(self, choices, clear=False):
         """
@@ -70,8 +85,9 @@ class WeightedSelector:
         if clear:
             self._weights.clear()
         self._weights.update(choices)
-        self._generate_p()
-        
+        self._stale = True
+        self._version += 1
+
     def _generate_p(self):
         """Generates cumulative p values for each choice."""
         self._values, weights = zip(*self._weights.items())
@@ -79,13 +95,104 @@ class WeightedSelector:
         total = cumsum[-1]
         self._p = [i / total for i in cumsum]
 
+    def _generate_alias(self):
+        """Generates the alias table for each choice, with Vose's method."""
+        self._values, weights = zip(*self._weights.items())
+        n = len(weights)
+        total = sum(weights)
+
+        scaled = [weight * n / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+
+        p = [1] * n
+        aliases = list(range(n))
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+
+            p[less] = scaled[less]
+            aliases[less] = more
+
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+        self._p = p
+        self._aliases = [self._values[i] for i in aliases]
+
+    def _generate(self):
+        """Regenerates the sampling table for the current weights."""
+        if self._alias:
+            self._generate_alias()
+        else:
+            self._generate_p()
+        self._stale = False
+
     def choose(self):
         """(*) Returns a random choice."""
-
-        i = bisect.bisect(self._p, random.random())
+        if self._stale:
+            self._generate()
+
+        if self._alias:
+            n = len(self._p)
+            r = self._random() * n
+            i = min(int(r), n - 1)
+            if r - i < self._p[i]:
+                return self._values[i]
+            return self._aliases[i]
+
+        i = bisect.bisect(self._p, self._random())
         return self._values[i]
 
-    def clone(self):
-        """(WeightedSelector) Returns a clone of this object."""
+    def choose_many(self, n):
+        """Returns n random choices, drawing the same random numbers as n calls
+        to choose.
+
+        Parameters:
+            n (int): The number of choices to make.
+
+        Return:
+            list<*>: The choices.
+        """
+        if self._stale:
+            self._generate()
+
+        values = self._values
+        p = self._p
+        rand = self._random
+
+        if self._alias:
+            aliases = self._aliases
+            k = len(p)
+            choices = []
+            for r in (rand() * k for _ in range(n)):
+                i = min(int(r), k - 1)
+                choices.append(values[i] if r - i < p[i] else aliases[i])
+            return choices
+
+        return [values[bisect.bisect(p, rand())] for _ in range(n)]
+
+    def get_weights(self):
+        """(dict<*, num>) Returns a copy of the map of choices to weights."""
+        return dict(self._weights)
+
+    def get_version(self):
+        """(int) Returns a number which changes whenever the weights change."""
+        return self._version
+
+    def get_rng(self):
+        """(random.Random) Returns the random number generator drawn from, or
+        None if it is the random module's shared generator."""
+        return self._rng
+
+    def clone(self, rng=None):
+        """(WeightedSelector) Returns a clone of this object.
+
+        Parameters:
+            rng (random.Random): The random number generator for the clone to
+                                 draw from. Defaults to this object's.
+        """
+        if rng is None:
+            rng = self._rng
 
-        return WeightedSelector(self._weights)
\ No newline at end of file
+        return WeightedSelector(self._weights, alias=self._alias, rng=rng)
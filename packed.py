@@ -0,0 +1,736 @@
+"""Integer-encoded Lolo games for headless simulation.
+
+Each cell of a packed game is a single integer, (value << TYPE_BITS) | code,
+where code indexes the game's table of tile types and 0 is an empty cell.
+Cells are held in a flat row-major array, with no tile objects, and grouping,
+joining, gravity & explosions operate on the integers directly.
+
+Packed games follow the rules of their object model counterparts exactly:
+given the same sequence of tile selections, they reach the same grids & scores.
+They do not support disabled tiles or animation.
+"""
+
+import copy
+import random
+from array import array
+
+from modules import grid_codec
+from modules import matrix
+from modules.ee import EventEmitter
+from modules.weighted_selector import WeightedSelector
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2017, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.2"
+
+# Number of low bits holding a cell's type code
+TYPE_BITS = 8
+TYPE_MASK = (1 << TYPE_BITS) - 1
+
+# An empty cell
+EMPTY = 0
+
+
+class PackedGame(EventEmitter):
+    """Abstract base class for a game of Lolo on an integer-encoded grid.
+
+    Emits the same 'score', 'resolve' & 'game_over' events as
+    model.AbstractGame."""
+
+    GAME_NAME = "Abstract"
+
+    # Mask applied to cells before comparing them for connection
+    KEY_MASK = TYPE_MASK
+
+    def __init__(self, size, selector, min_group, autofill=True):
+        """Constructor
+
+        Parameters:
+            size (tuple<int, int>): The (row, column) size of the game.
+            selector (WeightedSelector): Chooses the type of new tiles.
+            min_group (int): The minimum number of tiles for a connection to
+                             be a group.
+            autofill (bool): Automatically fills the grid iff True.
+        """
+        super().__init__()
+        rows, columns = size
+        self._size = size
+        self._cells = array('q', [EMPTY]) * (rows * columns)
+        self._selector = selector
+        self.min_group = min_group
+
+        # Type table; code 0 is reserved for empty cells
+        self._types = [None]
+        self._codes = {}
+
+        # Neighbouring indices of every index
+        grid = matrix.Matrix(rows, columns)
+        self._axial = self._index_table(grid, matrix.AXIAL_DELTAS)
+        self._radial = self._index_table(grid, matrix.RADIAL_DELTAS)
+
+        if autofill:
+            self.fill()
+            self._score = self.get_default_score()
+
+    @staticmethod
+    def _index_table(grid, deltas):
+        """(list<tuple<int, ...>>) Returns the neighbouring indices of every
+        index in grid, for the given deltas."""
+        table = grid.get_neighbour_table(deltas)
+        return [tuple(grid.index(neighbour) for neighbour in table[position])
+                for position in grid]
+
+    def _encode_type(self, type):
+        """(int) Returns the code for a tile type, adding it to the table if it
+        is new."""
+        code = self._codes.get(type)
+        if code is None:
+            code = self._codes[type] = len(self._types)
+            if code > TYPE_MASK:
+                raise ValueError("Too many tile types.")
+            self._types.append(type)
+        return code
+
+    def size(self):
+        """(tuple<int, int>) Returns the (row, column) size of the grid."""
+        return self._size
+
+    def get_default_score(self):
+        """(int) Returns the default score."""
+        raise NotImplementedError
+
+    def is_resolving(self):
+        """(bool) Returns False; packed games resolve moves synchronously."""
+        return False
+
+    @classmethod
+    def get_name(cls):
+        """(str) Returns the name of the game."""
+        return cls.GAME_NAME
+
+    def get_score(self):
+        """(int) Returns the score."""
+        return self._score
+
+    def get_rng(self):
+        """(random.Random) Returns the game's random number generator."""
+        return self._selector.get_rng()
+
+    def set_score(self, score):
+        """Sets the score."""
+        self._score = score
+        self.emit('score', score)
+
+    def clone(self):
+        """Returns an independent copy of this game, for trying out moves.
+
+        The copy's random number generator starts from the same state, so both
+        generate the same tiles. Event listeners are not copied.
+
+        Return:
+            PackedGame: The copy.
+        """
+        game = copy.copy(self)
+        EventEmitter.__init__(game)
+
+        game._cells = array('q', self._cells)
+        game._types = list(self._types)
+        game._codes = dict(self._codes)
+
+        rng = random.Random()
+        rng.setstate(self.get_rng().getstate())
+        game._selector = self._selector.clone(rng=rng)
+        return game
+
+    def reset(self):
+        """Resets the game."""
+        cells = self._cells
+        for index in range(len(cells)):
+            cells[index] = EMPTY
+        self.fill()
+        self.set_score(self.get_default_score())
+
+    def fill(self):
+        """Fills all empty cells with newly generated tiles."""
+        cells = self._cells
+        indices = [index for index, cell in enumerate(cells) if cell == EMPTY]
+        for index, cell in zip(indices, self._generate(len(indices))):
+            cells[index] = cell
+
+    def _generate(self, n):
+        """(list<int>) Returns n newly generated cells."""
+        make_cell = self._make_cell
+        return [make_cell(selection)
+                for selection in self._selector.choose_many(n)]
+
+    def _make_cell(self, type, value=1):
+        """(int) Returns the cell for a tile, as would be constructed by the
+        object model from the type & value."""
+        raise NotImplementedError
+
+    def _join(self, cell, others):
+        """(int) Returns cell after the other cells are joined to it."""
+        raise NotImplementedError
+
+    def _is_max(self, cell):
+        """(bool) Returns True iff cell holds a maximum tile."""
+        return False
+
+    def _is_combo_max(self, cell):
+        """(bool) Returns True iff cell holds a combined maximum tile."""
+        return False
+
+    def _update_score_on_activate(self, cell, connected):
+        """Updates the score based upon the current cell & the number of cells
+        that were joined to it."""
+        raise NotImplementedError
+
+    def _check_unlock_max(self, cell):
+        """Unlocks the max tile if the current cell is a max tile."""
+
+    def _cell_data(self, cell):
+        """(tuple<*, int>) Returns the serialized (type, value) pair of a
+        cell."""
+        return self._types[cell & TYPE_MASK], cell >> TYPE_BITS
+
+    def _find_group(self, root):
+        """(list<int>) Returns the indices of all cells connected to the one at
+        root, including root."""
+        cells = self._cells
+        neighbours = self._axial
+        mask = self.KEY_MASK
+        key = cells[root] & mask
+
+        group = [root]
+        visited = {root}
+        nodes = [root]
+        while nodes:
+            for adjacent in neighbours[nodes.pop()]:
+                if adjacent not in visited and cells[adjacent] & mask == key:
+                    visited.add(adjacent)
+                    group.append(adjacent)
+                    nodes.append(adjacent)
+
+        return group
+
+    def _find_components(self, size=None):
+        """Returns the indices of the cells in each connected component.
+
+        Parameters:
+            size (int): If given, stops at the first component with at least
+                        this many cells.
+
+        Return:
+            list<list<int>>: Indices of each component.
+        """
+        cells = self._cells
+        neighbours = self._axial
+        mask = self.KEY_MASK
+        seen = bytearray(len(cells))
+
+        components = []
+        for root in range(len(cells)):
+            if seen[root]:
+                continue
+
+            seen[root] = 1
+            key = cells[root] & mask
+            group = [root]
+            nodes = [root]
+            while nodes:
+                for adjacent in neighbours[nodes.pop()]:
+                    if not seen[adjacent] and cells[adjacent] & mask == key:
+                        seen[adjacent] = 1
+                        group.append(adjacent)
+                        nodes.append(adjacent)
+
+            components.append(group)
+            if size is not None and len(group) >= size:
+                break
+
+        return components
+
+    def _to_positions(self, indices):
+        """(frozenset<tuple<int, int>>) Returns the positions of indices."""
+        columns = self._size[1]
+        return frozenset(divmod(index, columns) for index in indices)
+
+    def find_groups(self):
+        """Yields all the valid groups within the grid. Groups are connected and
+        must have at least 'self.min_group' members.
+
+        Yield:
+            frozenset<tuple<int, int>>: A set of (row, column) positions for each connected tile, including root.
+        """
+        for group in self._find_components():
+            if len(group) >= self.min_group:
+                yield self._to_positions(group)
+
+    def find_group(self, position):
+        """Returns the group containing the tile at position, or None if no such
+        group exists. A group must have at least 'self.min_group' members.
+
+        Parameters:
+            position (tuple<int, int>): Row, column position of the tile.
+
+        Return:
+            None: If tile is not part of a group.
+            frozenset<tuple<int, int>>: A set of (row, column) positions for each connected tile, including root.
+        """
+        row, column = position
+        group = self._find_group(row * self._size[1] + column)
+
+        if len(group) < self.min_group:
+            return None
+
+        return self._to_positions(group)
+
+    def can_activate(self, position):
+        """(bool) Returns true iff the given position can be activated."""
+        return self.find_group(position) is not None
+
+    def game_over(self):
+        """(bool) Returns True iff the game is over."""
+        if self.min_group <= 1:
+            return not self._cells
+
+        if self.min_group == 2:
+            cells = self._cells
+            neighbours = self._axial
+            mask = self.KEY_MASK
+            for index, cell in enumerate(cells):
+                key = cell & mask
+                for adjacent in neighbours[index]:
+                    if cells[adjacent] & mask == key:
+                        return False
+            return True
+
+        return len(self._find_components(self.min_group)[-1]) < self.min_group
+
+    def activate(self, position):
+        """Activates the tile at the given position, resolving the move fully.
+
+        Parameters:
+            position (tuple<int, int>): The position to activate.
+
+        Raises:
+            IndexError: If position cannot be activated.
+        """
+        row, column = position
+        index = row * self._size[1] + column
+        cells = self._cells
+
+        group = self._find_group(index)
+        if len(group) < self.min_group:
+            raise IndexError("Tile at {} cannot be activated.".format(position))
+
+        connected = group[1:]
+        cell = cells[index] = self._join(cells[index],
+                                         [cells[other] for other in connected])
+
+        self._update_score_on_activate(cell, len(connected))
+        self._check_unlock_max(cell)
+
+        for other in connected:
+            cells[other] = EMPTY
+
+        index = self._replace_blanks(index)
+        self._explode_combo(index)
+
+        self.emit('resolve')
+
+        if self.game_over():
+            self.emit('game_over')
+
+    def remove(self, *positions):
+        """Removes the tiles at the given positions, resolving the move fully.
+
+        Parameters:
+            *positions (tuple<int, int>): The positions to remove.
+        """
+        columns = self._size[1]
+        for row, column in positions:
+            self._cells[row * columns + column] = EMPTY
+
+        self._replace_blanks()
+
+        self.emit('resolve')
+
+        if self.game_over():
+            self.emit('game_over')
+
+    def _explode_combo(self, index):
+        """Explodes the cell at index and all surrounding cells, if it holds a
+        combined maximum tile."""
+        cells = self._cells
+        cell = cells[index]
+
+        if self._is_combo_max(cell):
+            cells[index] = EMPTY
+            for neighbour in self._radial[index]:
+                cells[neighbour] = EMPTY
+
+            self.set_score(self.get_score() + (cell >> TYPE_BITS))
+
+            self._replace_blanks()
+
+    def _replace_blanks(self, track=None):
+        """Drops tiles into empty cells below them, then fills each column from
+        the top, in the same order as model.LoloGrid.replace_blanks.
+
+        Parameters:
+            track (int): The index of a cell to follow.
+
+        Return:
+            int: The index that the tracked cell dropped to.
+        """
+        rows, columns = self._size
+        cells = self._cells
+        empties = []
+        tracked = track
+
+        for column in range(columns):
+            target = (rows - 1) * columns + column
+            for index in range(target, -1, -columns):
+                cell = cells[index]
+                if cell != EMPTY:
+                    if index == track:
+                        tracked = target
+                    cells[target] = cell
+                    target -= columns
+
+            if target >= 0:
+                empties.append((column, target // columns + 1))
+                for index in range(target, -1, -columns):
+                    cells[index] = EMPTY
+
+        # Generate one tile for each column per frame, each landing on top of
+        # the last
+        targets = [(count - 1 - i) * columns + column
+                   for i in range(max((count for _, count in empties),
+                                      default=0))
+                   for column, count in empties if i < count]
+
+        for index, cell in zip(targets, self._generate(len(targets))):
+            cells[index] = cell
+
+        return tracked
+
+    def serialize(self, compact=False):
+        """
+        Serializes this game, in the format of model.AbstractGame.serialize.
+
+        Parameters:
+            compact (bool): If True, the grid is encoded as compact text by
+                            modules.grid_codec.
+
+        Return:
+            grid (list<list<tuple<int, int>>>|str): The serialized grid.
+        """
+        rows, columns = self._size
+        cells = self._cells
+        grid = [[self._cell_data(cells[row * columns + column])
+                 for column in range(columns)] for row in range(rows)]
+
+        if compact:
+            return grid_codec.dumps(grid)
+        return grid
+
+    @classmethod
+    def deserialize(cls, grid, *args, **kwargs):
+        """
+        Deserializes a game grid, in the format of model.AbstractGame.serialize.
+
+        Parameters:
+            grid (list<list<tuple<int, int>>>|str): A serialized grid list to
+                                                    load, or compact text.
+            *args: Extra positional arguments for the game.
+            **kwargs: Extra keyword arguments for the game.
+        """
+        if grid_codec.is_encoded(grid):
+            grid = grid_codec.loads(grid)
+
+        game = cls(*args, **kwargs)
+
+        columns = game.size()[1]
+        for row, row_data in enumerate(grid):
+            for column, (type, *rest) in enumerate(row_data):
+                game._cells[row * columns + column] = game._load_cell(type,
+                                                                      *rest)
+
+        return game
+
+    def _load_cell(self, type, value=1):
+        """(int) Returns the cell for a serialized (type, value) pair."""
+        return self._make_cell(type, value)
+
+
+class PackedRegularGame(PackedGame):
+    """Regular game of Lolo on an integer-encoded grid.
+
+    See game_regular.RegularGame."""
+
+    GAME_NAME = "Regular"
+
+    def __init__(self, size=(6, 6), types=3, min_group=3,
+                 max_tile_value=50, max_tile_type='max', normal_weight=20,
+                 max_weight=2, autofill=True, seed=None):
+        """Constructor
+
+        Parameters:
+            size (tuple<int, int>): The number of (rows, columns) in the game.
+            types (int): The number of types of basic tiles.
+            min_group (int): The minimum number of tiles required for a
+                             connected group to be joinable.
+            max_tile_value (int): The value of a maximum tile.
+            max_tile_type (*): The type of a maximum tile.
+            normal_weight (int): The relative weighted probability that a basic
+                                 tile will be generated.
+            max_weight (int): The relative weighted probability that a maximum
+                              tile will be generated.
+            autofill (bool): Automatically fills the grid iff True.
+            seed (*): Seed for the game's random number generator. Randomly
+                      seeded if None.
+        """
+        self.max_tile_value = max_tile_value
+        self.max_tile_type = max_tile_type
+        self.types = types
+        self._max_unlocked = False
+
+        self.normal_likelihood = normal_weight
+        self.max_likelihood = max_weight
+
+        weighted_types = {i: normal_weight for i in range(1, types + 1)}
+        selector = WeightedSelector(weighted_types, rng=random.Random(seed))
+
+        super().__init__(size, selector, min_group, autofill=False)
+
+        self._max_code = self._encode_type(max_tile_type)
+
+        if autofill:
+            self.fill()
+            self._score = self.get_default_score()
+
+    def get_default_score(self):
+        """(int) Returns the default score."""
+        return 0
+
+    def reset(self):
+        """Resets the game."""
+        super().reset()
+
+        self._lock_max()
+
+    def _make_cell(self, type, value=1):
+        code = self._encode_type(type)
+        if code == self._max_code and value < self.max_tile_value:
+            return (self.max_tile_value << TYPE_BITS) | code
+        return (value << TYPE_BITS) | code
+
+    def _join(self, cell, others):
+        value = cell >> TYPE_BITS
+        for other in others:
+            value += other >> TYPE_BITS
+
+        code = cell & TYPE_MASK
+        if code != self._max_code and value >= self.max_tile_value:
+            return (self.max_tile_value << TYPE_BITS) | self._max_code
+        return (value << TYPE_BITS) | code
+
+    def _is_max(self, cell):
+        return cell & TYPE_MASK == self._max_code
+
+    def _is_combo_max(self, cell):
+        return (cell & TYPE_MASK == self._max_code
+                and cell >> TYPE_BITS > self.max_tile_value)
+
+    def _check_unlock_max(self, cell):
+        if not self._max_unlocked and self._is_max(cell):
+            self._selector.update({
+                self.max_tile_type: self.max_likelihood
+            })
+            self._max_unlocked = True
+
+    def _lock_max(self):
+        """Locks max tile."""
+        del self._selector[self.max_tile_type]
+        self._max_unlocked = False
+
+    def _update_score_on_activate(self, cell, connected):
+        factor = 50 if self._is_combo_max(cell) else 1
+        points = (connected + 1) * factor
+        self.set_score(self.get_score() + points)
+
+
+class PackedUnlimitedGame(PackedRegularGame):
+    """Unlimited game of Lolo on an integer-encoded grid.
+
+    See game_unlimited.UnlimitedGame."""
+
+    GAME_NAME = "Unlimited"
+
+    def __init__(self, size=(8, 8), types=4, min_group=3, autofill=True,
+                 seed=None):
+        """Constructor
+
+        Parameters:
+            size (tuple<int, int>): The number of (rows, columns) in the game.
+            types (int): The number of tiles.
+            min_group (int): The minimum number of tiles required for a
+                             connected group to be joinable.
+            autofill (bool): Automatically fills the grid iff True.
+            seed (*): Seed for the game's random number generator. Randomly
+                      seeded if None.
+        """
+        super().__init__(size=size, types=types, min_group=min_group,
+                         max_tile_value=float('inf'), autofill=autofill,
+                         seed=seed)
+
+    def get_default_score(self):
+        """(int) Returns the default score."""
+        return max(cell >> TYPE_BITS for cell in self._cells)
+
+    def _update_score_on_activate(self, cell, connected):
+        value = cell >> TYPE_BITS
+        if value > self._score:
+            self.set_score(value)
+
+
+class PackedMake13Game(PackedRegularGame):
+    """Make13 game of Lolo on an integer-encoded grid.
+
+    Every cell has the same type code; tiles connect iff their values are equal.
+    See game_make13.Make13Game."""
+
+    GAME_NAME = "Make 13"
+
+    KEY_MASK = -1
+
+    def __init__(self, size=(6, 6), initial_tiles=4, goal_value=13, min_group=2,
+                 autofill=True, seed=None):
+        """Constructor
+
+        Parameters:
+            size (tuple<int, int>): The number of (rows, columns) in the game.
+            initial_tiles (int): The number of tiles.
+            goal_value (int): The value of the goal tile.
+            min_group (int): The minimum number of tiles required for a
+                             connected group to be joinable.
+            autofill (bool): Automatically fills the grid iff True.
+            seed (*): Seed for the game's random number generator. Randomly
+                      seeded if None.
+        """
+        self.goal_value = goal_value
+        self.initial_tiles = initial_tiles
+
+        super().__init__(size=size, min_group=min_group, autofill=False,
+                         seed=seed)
+
+        self._level_code = self._encode_type(None)
+        self._selector.update(self._get_initial_weights(), clear=True)
+
+        if autofill:
+            self.fill()
+            self._score = self.get_default_score()
+
+    def get_default_score(self):
+        """(int) Returns the default score."""
+        return max(cell >> TYPE_BITS for cell in self._cells)
+
+    def reset(self):
+        """Resets the game."""
+        self._selector.update(self._get_initial_weights(), clear=True)
+        super().reset()
+
+    def _get_initial_weights(self):
+        """(dict<int, float>) Returns the weights of the initial tiles."""
+        return {i: self.get_tile_weight(i) for i in
+                range(1, self.initial_tiles + 1)}
+
+    def get_tile_weight(self, value):
+        """(float) Returns the weighting for a tile of given value."""
+        return 2 ** (self.goal_value - value)
+
+    def _make_cell(self, type, value=1):
+        # The type of a level tile is its value
+        return (type << TYPE_BITS) | self._level_code
+
+    def _load_cell(self, type, value=1):
+        return self._make_cell(type)
+
+    def _cell_data(self, cell):
+        value = cell >> TYPE_BITS
+        return value, value
+
+    def _join(self, cell, others):
+        return cell + (1 << TYPE_BITS)
+
+    def _is_max(self, cell):
+        return False
+
+    def _is_combo_max(self, cell):
+        return False
+
+    def _update_score_on_activate(self, cell, connected):
+        value = cell >> TYPE_BITS
+        if value > self._score:
+            self._score = value
+            self._selector[value] = self.get_tile_weight(value)
+            self.set_score(value)
+
+        if value == self.goal_value:
+            self.emit('game_over')
+
+
+class PackedLucky7Game(PackedMake13Game):
+    """Lucky7 game of Lolo on an integer-encoded grid.
+
+    See game_lucky7.Lucky7Game."""
+
+    GAME_NAME = "Lucky 7"
+
+    def __init__(self, size=(6, 6), initial_tiles=4, lucky_value=7, min_group=3,
+                 autofill=True, seed=None):
+        """Constructor
+
+        Parameters:
+            size (tuple<int, int>): The number of (rows, columns) in the game.
+            initial_tiles (int): The number of tiles.
+            lucky_value (int): The value of the lucky tile.
+            min_group (int): The minimum number of tiles required for a
+                             connected group to be joinable.
+            autofill (bool): Automatically fills the grid iff True.
+            seed (*): Seed for the game's random number generator. Randomly
+                      seeded if None.
+        """
+        self.lucky_value = lucky_value
+
+        super().__init__(size=size, initial_tiles=initial_tiles,
+                         goal_value=lucky_value + 1, min_group=min_group,
+                         autofill=autofill, seed=seed)
+
+    def get_default_score(self):
+        """(int) Returns the default score."""
+        return 0
+
+    def _is_max(self, cell):
+        return cell >> TYPE_BITS == self.lucky_value
+
+    def _is_combo_max(self, cell):
+        return cell >> TYPE_BITS == self.lucky_value
+
+    def _check_unlock_max(self, cell):
+        """Max tile cannot be unlocked in Lucky 7"""
+
+    def _update_score_on_activate(self, cell, connected):
+        value = cell >> TYPE_BITS
+
+        if value == 1:
+            score = 5
+        elif value == self.lucky_value:
+            score = (value - 2) * 20
+        else:
+            score = (value - 1) * 10
+
+        self.set_score(self.get_score() + score)
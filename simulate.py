@@ -0,0 +1,280 @@
+"""Plays games of Lolo headlessly, to measure simulation throughput.
+
+Only the modelling modules are imported, never tkinter, so this runs anywhere.
+
+Usage:
+    python simulate.py --mode regular --games 1000 --policy random
+    python simulate.py --mode lucky7 --games 100000 --workers 0
+    python simulate.py --mode regular --games 10 --policy beam --budget 0.02
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import functools
+import os
+import random
+import statistics
+import time
+
+import game_lucky7
+import game_make13
+import game_regular
+import game_unlimited
+import solver
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2017, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.2"
+
+# Game classes for each mode
+MODES = {
+    'regular': game_regular.RegularGame,
+    'make13': game_make13.Make13Game,
+    'lucky7': game_lucky7.Lucky7Game,
+    'unlimited': game_unlimited.UnlimitedGame,
+}
+
+# The outcome of a single game
+GameRecord = collections.namedtuple('GameRecord',
+                                    ('seed', 'score', 'moves', 'grid'))
+
+
+def random_policy(game, rng):
+    """Returns a random position from any group, like a3.AutoPlay.
+
+    Parameters:
+        game (model.AbstractGame): The game to move in.
+        rng (random.Random): The policy's random number generator.
+
+    Return:
+        tuple<int, int>: The position to activate, or None if there is none.
+    """
+    cells = sorted(cell for group in game.find_groups() for cell in group)
+    return rng.choice(cells) if cells else None
+
+
+def largest_policy(game, rng):
+    """Returns the first position of the largest group.
+
+    Parameters:
+        game (model.AbstractGame): The game to move in.
+        rng (random.Random): The policy's random number generator. Unused.
+
+    Return:
+        tuple<int, int>: The position to activate, or None if there is none.
+    """
+    groups = list(game.find_groups())
+    if not groups:
+        return None
+    return min(max(groups, key=len))
+
+
+# Policies by name. Each is called with (game, rng) & returns a position
+POLICIES = {
+    'random': random_policy,
+    'largest': largest_policy,
+}
+
+
+def get_policy(name, rng, budget=None):
+    """Returns a function that chooses the position to activate in a game.
+
+    Parameters:
+        name (str): The name of the policy; a key of POLICIES or of
+                    solver.SOLVERS.
+        rng (random.Random): The policy's random number generator.
+        budget (float): The time, in seconds, a solver may spend choosing each
+                        move. Defaults to the solver's default.
+
+    Return:
+        function: Called with a game. Returns the position, or None if there
+                  is none.
+    """
+    if name in POLICIES:
+        return functools.partial(POLICIES[name], rng=rng)
+
+    kwargs = {'rng': rng}
+    if budget is not None:
+        kwargs['budget'] = budget
+    return solver.SOLVERS[name](**kwargs).choose
+
+
+def get_game_class(mode, packed=False):
+    """Returns the class of game for a mode.
+
+    Parameters:
+        mode (str): The name of the mode; a key of MODES.
+        packed (bool): If True, returns the integer-encoded packed game.
+    """
+    if not packed:
+        return MODES[mode]
+
+    import packed as packed_games
+    return {
+        'regular': packed_games.PackedRegularGame,
+        'make13': packed_games.PackedMake13Game,
+        'lucky7': packed_games.PackedLucky7Game,
+        'unlimited': packed_games.PackedUnlimitedGame,
+    }[mode]
+
+
+def play(mode, seed, policy='random', size=None, max_moves=None,
+         packed=False, budget=None):
+    """Plays a single game until it is over.
+
+    The game's tiles and the policy's choices are both seeded from seed, so
+    the same arguments always produce the same record.
+
+    Parameters:
+        mode (str): The name of the mode; a key of MODES.
+        seed (int): Seed for the game & policy.
+        policy (str): The name of the policy; a key of POLICIES or of
+                      solver.SOLVERS.
+        size (tuple<int, int>): The (rows, columns) of the game. Defaults to
+                                the mode's default size.
+        max_moves (int): The number of moves after which to stop. Unlimited if
+                         None.
+        packed (bool): If True, plays the integer-encoded packed game.
+        budget (float): The time, in seconds, a solver may spend choosing each
+                        move.
+
+    Return:
+        GameRecord: The outcome of the game.
+    """
+    kwargs = {'seed': seed}
+    if size is not None:
+        kwargs['size'] = size
+    if not packed:
+        kwargs['animation'] = False
+
+    game = get_game_class(mode, packed)(**kwargs)
+    choose = get_policy(policy, random.Random(seed), budget)
+
+    over = []
+    game.on('game_over', lambda: over.append(True))
+
+    moves = 0
+    while not over and (max_moves is None or moves < max_moves):
+        position = choose(game)
+        if position is None:
+            break
+
+        # Drain the resolution steps
+        steps = game.activate(position)
+        if steps is not None:
+            for _ in steps:
+                pass
+
+        moves += 1
+
+    return GameRecord(seed, game.get_score(), moves, game.serialize())
+
+
+def play_many(mode, seeds, workers=1, chunksize=16, **options):
+    """Plays a game for each seed, sharding the seeds across processes.
+
+    Records are yielded in order of seeds as they complete. Each game depends
+    only on its seed & options, so the records are identical however many
+    workers are used.
+
+    Parameters:
+        mode (str): The name of the mode; a key of MODES.
+        seeds (iterable(int)): The seed of each game.
+        workers (int): The number of worker processes. Uses every core if None
+                       and plays in this process if 1.
+        chunksize (int): The number of seeds sent to a worker at a time.
+        **options: Extra keyword arguments for play.
+
+    Yield:
+        GameRecord: The outcome of each game.
+    """
+    play_seed = functools.partial(play, mode, **options)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers == 1:
+        yield from map(play_seed, seeds)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(play_seed, seeds, chunksize=chunksize)
+
+
+def report(records, elapsed):
+    """Prints throughput & score statistics for a batch of games.
+
+    Parameters:
+        records (list<GameRecord>): The outcomes of the games.
+        elapsed (float): The time taken to play them, in seconds.
+    """
+    scores = [record.score for record in records]
+    moves = sum(record.moves for record in records)
+
+    print("Games:       {}".format(len(records)))
+    print("Moves:       {}".format(moves))
+    print("Time:        {:.3f}s".format(elapsed))
+    print("Games/sec:   {:.1f}".format(len(records) / elapsed))
+    print("Moves/sec:   {:.1f}".format(moves / elapsed))
+
+    if not scores:
+        return
+
+    print("Score min:   {}".format(min(scores)))
+    print("Score mean:  {:.1f}".format(statistics.mean(scores)))
+    print("Score max:   {}".format(max(scores)))
+    if len(scores) > 1:
+        print("Score stdev: {:.1f}".format(statistics.stdev(scores)))
+        deciles = statistics.quantiles(scores, n=10)
+        print("Score p10/p50/p90: {} / {} / {}".format(deciles[0], deciles[4],
+                                                       deciles[8]))
+
+
+def parse_size(text):
+    """(tuple<int, int>) Parses a size of the form ROWSxCOLUMNS."""
+    rows, columns = text.lower().split('x')
+    return int(rows), int(columns)
+
+
+def get_parser():
+    """(argparse.ArgumentParser) Returns the command line argument parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=sorted(MODES), default='regular')
+    parser.add_argument('--games', type=int, default=100,
+                        help="number of games to play")
+    parser.add_argument('--policy',
+                        choices=sorted(set(POLICIES) | set(solver.SOLVERS)),
+                        default='random')
+    parser.add_argument('--budget', type=float, default=None,
+                        help="time for a solver to choose each move, in "
+                             "seconds")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="seed of the first game; each game adds one")
+    parser.add_argument('--size', type=parse_size, default=None,
+                        help="board size as ROWSxCOLUMNS")
+    parser.add_argument('--max-moves', type=int, default=None,
+                        help="stop each game after this many moves")
+    parser.add_argument('--packed', action='store_true',
+                        help="play the integer-encoded packed games")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of worker processes; 0 uses every core")
+    return parser
+
+
+def main(argv=None):
+    """Plays games as configured on the command line & reports on them."""
+    args = get_parser().parse_args(argv)
+
+    start = time.perf_counter()
+    records = list(play_many(args.mode, range(args.seed,
+                                              args.seed + args.games),
+                             workers=args.workers or None, policy=args.policy,
+                             size=args.size, max_moves=args.max_moves,
+                             packed=args.packed, budget=args.budget))
+    report(records, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,669 @@
+"""Automatic players for Lolo, which search clones of a game for good moves.
+
+Solvers work with both the object model & the packed games. Each spends at
+most its time budget choosing a move, then returns the best move found so far.
+
+Usage:
+    python solver.py --mode regular --budget 0.05
+    python solver.py --mode lucky7 --solver beam expectimax --seed 3
+"""
+
+import argparse
+import concurrent.futures
+import math
+import random
+import time
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2017, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.2"
+
+
+class SearchTimeout(Exception):
+    """Raised within a search when its time budget has run out."""
+
+
+def get_moves(game):
+    """Returns every position that can be activated.
+
+    Groups are ordered from largest to smallest, and their cells are
+    interleaved, so that any prefix of the moves covers as many groups as
+    possible.
+
+    Parameters:
+        game (model.AbstractGame): The game to move in.
+
+    Return:
+        list<tuple<int, int>>: The positions.
+    """
+    groups = sorted((sorted(group) for group in game.find_groups()),
+                    key=lambda group: (-len(group), group[0]))
+
+    moves = []
+    for rank in range(len(groups[0]) if groups else 0):
+        for group in groups:
+            if rank >= len(group):
+                break
+            moves.append(group[rank])
+    return moves
+
+
+def play_move(game, position):
+    """Activates a position in a game & resolves the move fully.
+
+    Parameters:
+        game (model.AbstractGame): The game to move in.
+        position (tuple<int, int>): The position to activate.
+
+    Return:
+        bool: True iff the game emitted game_over during the move.
+    """
+    over = []
+    game.on('game_over', lambda: over.append(True))
+
+    steps = game.activate(position)
+    if steps is not None:
+        for _ in steps:
+            pass
+
+    return bool(over)
+
+
+class Solver:
+    """Abstract base class for a player that chooses moves by playing them on
+    clones of a game.
+
+    The clones' random number generators are reseeded from the solver's, so
+    searches sample tile draws rather than foreseeing the game's own."""
+
+    NAME = "Abstract"
+
+    # Value subtracted from the score of a game that has been lost
+    LOSS_PENALTY = 10000
+
+    def __init__(self, budget=0.1, rng=None):
+        """Constructor
+
+        Parameters:
+            budget (float): The maximum time, in seconds, to spend choosing
+                            each move.
+            rng (random.Random): The solver's random number generator. Defaults
+                                 to a new, randomly seeded generator.
+        """
+        self._budget = budget
+        self._rng = rng if rng is not None else random.Random()
+        self._deadline = None
+
+        # Totals across every move chosen
+        self.nodes = 0
+        self.elapsed = 0.0
+
+    @classmethod
+    def get_name(cls):
+        """(str) Returns the name of the solver."""
+        return cls.NAME
+
+    def close(self):
+        """Releases any resources held by the solver."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def choose(self, game):
+        """Returns the position to activate next in a game.
+
+        Parameters:
+            game (model.AbstractGame): The game to move in. It is not changed.
+
+        Return:
+            tuple<int, int>: The position, or None if there is no move.
+        """
+        moves = get_moves(game)
+        if not moves:
+            return None
+
+        start = time.perf_counter()
+        self._deadline = start + self._budget
+        try:
+            return self._choose(game, moves)
+        finally:
+            self.elapsed += time.perf_counter() - start
+
+    def _choose(self, game, moves):
+        """(tuple<int, int>) Returns the best of the moves in game.
+
+        Parameters:
+            game (model.AbstractGame): The game to move in.
+            moves (list<tuple<int, int>>): The possible moves, from get_moves.
+        """
+        raise NotImplementedError
+
+    def nodes_per_second(self):
+        """(float) Returns the number of moves simulated per second spent
+        choosing, across every move chosen so far."""
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def _play(self, game, position):
+        """Plays a move on a clone of a game.
+
+        Parameters:
+            game (model.AbstractGame): The game to move in. It is not changed.
+            position (tuple<int, int>): The position to activate.
+
+        Raises:
+            SearchTimeout: If the time budget has run out.
+
+        Return:
+            tuple<model.AbstractGame, bool>: The clone after the move, and
+                                             True iff the move ended the game.
+        """
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+        child = game.clone()
+        child.get_rng().seed(self._rng.getrandbits(64))
+
+        over = play_move(child, position)
+        self.nodes += 1
+
+        return child, over
+
+    def _evaluate(self, game, over):
+        """Returns the value of a game to the solver: its score, penalised if
+        the game has been lost. A game can also be over because it was won,
+        as in Make 13.
+
+        Parameters:
+            game (model.AbstractGame): The game to evaluate.
+            over (bool): True iff the game has emitted game_over.
+
+        Return:
+            float: The value.
+        """
+        score = game.get_score()
+        if over and game.game_over():
+            score -= self.LOSS_PENALTY
+        return score
+
+
+class RandomSolver(Solver):
+    """Chooses a random cell from any group, like the original AutoPlay."""
+
+    NAME = "random"
+
+    def _choose(self, game, moves):
+        return self._rng.choice(moves)
+
+
+class GreedySolver(Solver):
+    """Chooses the move that scores the most immediately."""
+
+    NAME = "greedy"
+
+    def _choose(self, game, moves):
+        best, best_score = moves[0], None
+
+        try:
+            for position in moves:
+                child, over = self._play(game, position)
+                score = self._evaluate(child, over)
+                if best_score is None or score > best_score:
+                    best, best_score = position, score
+        except SearchTimeout:
+            pass
+
+        return best
+
+
+class ExpectimaxSolver(Solver):
+    """Chooses the move with the highest expected score a number of moves
+    ahead, averaging over sampled tile draws.
+
+    Searches one move ahead, then two, and so on up to depth, until the time
+    budget runs out. The result of the deepest completed search is used."""
+
+    NAME = "expectimax"
+
+    def __init__(self, budget=0.1, rng=None, depth=2, samples=3, breadth=8):
+        """Constructor
+
+        Parameters:
+            budget (float): The maximum time, in seconds, to spend choosing
+                            each move.
+            rng (random.Random): The solver's random number generator.
+            depth (int): The maximum number of moves to look ahead.
+            samples (int): The number of tile draws sampled for each move.
+            breadth (int): The maximum number of moves considered at each
+                           position, taken in order of get_moves.
+        """
+        super().__init__(budget, rng)
+        self._depth = depth
+        self._samples = samples
+        self._breadth = breadth
+
+    def _choose(self, game, moves):
+        best = moves[0]
+
+        try:
+            for depth in range(1, self._depth + 1):
+                best, _ = self._best_move(game, moves, depth)
+        except SearchTimeout:
+            pass
+
+        return best
+
+    def _best_move(self, game, moves, depth):
+        """Returns the move with the highest expected value.
+
+        Parameters:
+            game (model.AbstractGame): The game to move in.
+            moves (list<tuple<int, int>>): The possible moves.
+            depth (int): The number of moves to look ahead.
+
+        Return:
+            tuple<tuple<int, int>, float>: The best move & its value.
+        """
+        best, best_value = None, None
+        for position in moves[:self._breadth]:
+            value = self._expect(game, position, depth)
+            if best_value is None or value > best_value:
+                best, best_value = position, value
+        return best, best_value
+
+    def _expect(self, game, position, depth):
+        """(float) Returns the mean value of a move over sampled tile draws,
+        looking depth moves ahead, including this one."""
+        total = 0
+        for _ in range(self._samples):
+            child, over = self._play(game, position)
+
+            moves = None if over or depth == 1 else get_moves(child)
+            if moves:
+                total += self._best_move(child, moves, depth - 1)[1]
+            else:
+                total += self._evaluate(child, over)
+
+        return total / self._samples
+
+
+class BeamSolver(Solver):
+    """Chooses the first move of the best sequence of moves found by beam
+    search.
+
+    At each step, every move is played from each game in the beam, and the
+    most valuable results form the next beam."""
+
+    NAME = "beam"
+
+    def __init__(self, budget=0.1, rng=None, width=8, depth=4):
+        """Constructor
+
+        Parameters:
+            budget (float): The maximum time, in seconds, to spend choosing
+                            each move.
+            rng (random.Random): The solver's random number generator.
+            width (int): The number of games kept in the beam at each step.
+            depth (int): The maximum number of moves to look ahead.
+        """
+        super().__init__(budget, rng)
+        self._width = width
+        self._depth = depth
+
+    def _choose(self, game, moves):
+        best = moves[0]
+
+        # Each entry is (value, first move, game, whether the game is over)
+        beam = [(game.get_score(), None, game, False)]
+
+        try:
+            for _ in range(self._depth):
+                candidates = []
+                for value, first, state, over in beam:
+                    state_moves = None if over else (
+                        moves if first is None else get_moves(state))
+
+                    if not state_moves:
+                        candidates.append((value, first, state, True))
+                        continue
+
+                    for position in state_moves:
+                        child, child_over = self._play(state, position)
+                        candidates.append((self._evaluate(child, child_over),
+                                           position if first is None
+                                           else first, child, child_over))
+
+                candidates.sort(key=lambda candidate: candidate[0],
+                                reverse=True)
+                beam = candidates[:self._width]
+                best = beam[0][1]
+
+                if all(over for _, _, _, over in beam):
+                    break
+        except SearchTimeout:
+            pass
+
+        return best
+
+
+class _Node:
+    """A game in the search tree of MCTSSolver."""
+
+    __slots__ = ('game', 'over', 'untried', 'children', 'visits', 'total')
+
+    def __init__(self, game, over, moves):
+        """Constructor
+
+        Parameters:
+            game (model.AbstractGame): The game at this node.
+            over (bool): True iff the game has emitted game_over.
+            moves (list<tuple<int, int>>): The moves that can be played from
+                                           the game.
+        """
+        self.game = game
+        self.over = over
+
+        # Moves not yet expanded, in reverse order of preference
+        self.untried = moves[::-1]
+        self.children = {}
+
+        self.visits = 0
+        self.total = 0.0
+
+
+def _search_worker(game, moves, budget, seed, options):
+    """Runs one MCTSSolver search in a worker process.
+
+    Parameters:
+        game (model.AbstractGame): The game to search from.
+        moves (list<tuple<int, int>>): The possible moves, from get_moves.
+        budget (float): The time to search for, in seconds.
+        seed (int): Seed for the search's random number generator.
+        options (dict<str, *>): Keyword arguments for MCTSSolver.
+
+    Return:
+        tuple<dict, int>: The statistics of each move, as returned by
+                          MCTSSolver._search, & the number of nodes expanded.
+    """
+    solver = MCTSSolver(budget=budget, rng=random.Random(seed), **options)
+    solver._deadline = time.perf_counter() + budget
+    return solver._search(game, moves), solver.nodes
+
+
+class MCTSSolver(Solver):
+    """Chooses moves by Monte Carlo tree search, with UCT selection.
+
+    Each iteration descends the tree by the UCB1 rule, expands one new move,
+    then plays a rollout from it. Tile draws are sampled once per expanded
+    move. The most visited move from the root is chosen.
+
+    With more than one worker, independent trees are searched in a pool of
+    processes (root parallelisation), and their root statistics are summed.
+    Call close, or use the solver as a context manager, to stop the pool.
+
+    Values are normalised to [0, 1] by the range seen so far in the search, as
+    scores are unbounded."""
+
+    NAME = "mcts"
+
+    # Rollout policies by name. Each is called with (moves, rng) & returns a
+    # move; greedy plays the largest group, which scores the most immediately
+    ROLLOUTS = {
+        'random': lambda moves, rng: rng.choice(moves),
+        'greedy': lambda moves, rng: moves[0],
+    }
+
+    def __init__(self, budget=0.1, rng=None, workers=1, rollout='random',
+                 rollout_depth=10, exploration=2 ** 0.5):
+        """Constructor
+
+        Parameters:
+            budget (float): The maximum time, in seconds, to spend choosing
+                            each move.
+            rng (random.Random): The solver's random number generator.
+            workers (int): The number of processes to search in. Searches in
+                           this process if 1.
+            rollout (str): The rollout policy; a key of ROLLOUTS.
+            rollout_depth (int): The maximum number of moves in a rollout.
+            exploration (float): The UCB1 exploration constant, applied to
+                                 values normalised to [0, 1].
+        """
+        super().__init__(budget, rng)
+        self._workers = workers
+        self._rollout_policy = self.ROLLOUTS[rollout]
+        self._rollout_depth = rollout_depth
+        self._exploration = exploration
+        self._options = {'rollout': rollout, 'rollout_depth': rollout_depth,
+                         'exploration': exploration}
+
+        self._executor = None
+
+        # Range of the values seen in the current search
+        self._low = self._high = None
+
+    def close(self):
+        """Stops the worker processes, if any are running."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _choose(self, game, moves):
+        if self._workers == 1:
+            stats = self._search(game, moves)
+        else:
+            stats = self._search_parallel(game, moves)
+
+        if not stats:
+            return moves[0]
+
+        return max(stats, key=lambda move: stats[move][0])
+
+    def _search_parallel(self, game, moves):
+        """Searches independent trees in the worker processes & sums the
+        statistics of their root moves.
+
+        Parameters:
+            game (model.AbstractGame): The game to search from.
+            moves (list<tuple<int, int>>): The possible moves, from get_moves.
+
+        Return:
+            dict<tuple<int, int>, tuple<int, float>>: The visits & total value
+                                                      of each move.
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self._workers)
+
+        # Event listeners may not be picklable, but clones have none
+        game = game.clone()
+        budget = self._deadline - time.perf_counter()
+
+        futures = [self._executor.submit(_search_worker, game, moves, budget,
+                                         self._rng.getrandbits(64),
+                                         self._options)
+                   for _ in range(self._workers)]
+
+        stats = {}
+        for future in futures:
+            worker_stats, nodes = future.result()
+            self.nodes += nodes
+
+            for move, (visits, total) in worker_stats.items():
+                merged_visits, merged_total = stats.get(move, (0, 0.0))
+                stats[move] = merged_visits + visits, merged_total + total
+
+        return stats
+
+    def _search(self, game, moves):
+        """Searches a tree from game until the time budget runs out.
+
+        Parameters:
+            game (model.AbstractGame): The game to search from.
+            moves (list<tuple<int, int>>): The possible moves, from get_moves.
+
+        Return:
+            dict<tuple<int, int>, tuple<int, float>>: The visits & total value
+                                                      of each expanded move.
+        """
+        root = _Node(game, False, moves)
+        self._low = self._high = None
+
+        try:
+            while time.perf_counter() < self._deadline:
+                self._iterate(root)
+        except SearchTimeout:
+            pass
+
+        return {move: (child.visits, child.total)
+                for move, child in root.children.items()}
+
+    def _iterate(self, root):
+        """Performs one selection, expansion, rollout & backpropagation."""
+        node = root
+        path = [node]
+
+        # Selection
+        while not node.untried and node.children:
+            node = self._select(node)
+            path.append(node)
+
+        # Expansion
+        if node.untried:
+            move = node.untried.pop()
+            game, over = self._play(node.game, move)
+            child = _Node(game, over, [] if over else get_moves(game))
+            node.children[move] = child
+
+            node = child
+            path.append(node)
+
+        value = self._rollout(node)
+
+        if self._low is None:
+            self._low = self._high = value
+        else:
+            self._low = min(self._low, value)
+            self._high = max(self._high, value)
+
+        # Backpropagation
+        for node in path:
+            node.visits += 1
+            node.total += value
+
+    def _select(self, node):
+        """(_Node) Returns the child of node with the highest UCB1 value."""
+        low, high = self._low, self._high
+        scale = high - low if high > low else 1
+        log_visits = math.log(node.visits)
+        exploration = self._exploration
+
+        best, best_bound = None, None
+        for child in node.children.values():
+            mean = (child.total / child.visits - low) / scale
+            bound = mean + exploration * math.sqrt(log_visits / child.visits)
+            if best_bound is None or bound > best_bound:
+                best, best_bound = child, bound
+        return best
+
+    def _rollout(self, node):
+        """(float) Plays moves by the rollout policy from a newly expanded node
+        & returns the value of the resulting game."""
+        if node.over or not node.untried:
+            return self._evaluate(node.game, True)
+
+        game = node.game.clone()
+        game.get_rng().seed(self._rng.getrandbits(64))
+
+        over = []
+        game.on('game_over', lambda: over.append(True))
+
+        moves = node.untried[::-1]
+        for _ in range(self._rollout_depth):
+            position = self._rollout_policy(moves, self._rng)
+
+            steps = game.activate(position)
+            if steps is not None:
+                for _ in steps:
+                    pass
+            self.nodes += 1
+
+            if over:
+                break
+
+            moves = get_moves(game)
+            if not moves:
+                break
+
+        return self._evaluate(game, bool(over))
+
+
+# Solver classes by name
+SOLVERS = {solver.NAME: solver for solver in
+           (RandomSolver, GreedySolver, ExpectimaxSolver, BeamSolver,
+            MCTSSolver)}
+
+
+def get_parser():
+    """(argparse.ArgumentParser) Returns the command line argument parser."""
+    import simulate
+
+    parser = argparse.ArgumentParser(
+        description="Compares solvers by playing a game with each.")
+    parser.add_argument('--mode', choices=sorted(simulate.MODES),
+                        default='regular')
+    parser.add_argument('--solver', nargs='+', choices=sorted(SOLVERS),
+                        default=sorted(SOLVERS))
+    parser.add_argument('--budget', type=float, default=0.1,
+                        help="time to choose each move, in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-moves', type=int, default=50,
+                        help="stop each game after this many moves")
+    parser.add_argument('--packed', action='store_true',
+                        help="play the integer-encoded packed games")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of worker processes for mcts")
+    return parser
+
+
+def main(argv=None):
+    """Plays a game with each solver named on the command line & reports the
+    scores & search speeds."""
+    import simulate
+
+    args = get_parser().parse_args(argv)
+
+    for name in args.solver:
+        kwargs = {'seed': args.seed}
+        if not args.packed:
+            kwargs['animation'] = False
+        game = simulate.get_game_class(args.mode, args.packed)(**kwargs)
+
+        options = {'budget': args.budget, 'rng': random.Random(args.seed)}
+        if name == MCTSSolver.NAME:
+            options['workers'] = args.workers
+
+        over = []
+        game.on('game_over', lambda: over.append(True))
+
+        moves = 0
+        with SOLVERS[name](**options) as solver:
+            while not over and moves < args.max_moves:
+                position = solver.choose(game)
+                if position is None:
+                    break
+
+                steps = game.activate(position)
+                if steps is not None:
+                    for _ in steps:
+                        pass
+                moves += 1
+
+        print("{:<12} score {:>6}  moves {:>4}  nodes/sec {:>9.1f}".format(
+            name, game.get_score(), moves, solver.nodes_per_second()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Tests that cloned, restored & deserialized games generate the same tiles as
+the game they were taken from."""
+
+import json
+import unittest
+
+import game_regular
+import tile_generators
+from solver import get_moves, play_move
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2017, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.2"
+
+
+class BufferedGame(game_regular.RegularGame):
+    GENERATOR_CLASS = tile_generators.BufferedGenerator
+
+
+def play(game, moves):
+    """Plays the first possible move of game a number of times.
+
+    Parameters:
+        game (model.AbstractGame): The game to move in.
+        moves (int): The number of moves to play.
+
+    Return:
+        list<list<tuple<int, int>>>: The serialized grid after each move.
+    """
+    grids = []
+    for _ in range(moves):
+        options = get_moves(game)
+        if not options:
+            break
+        play_move(game, options[0])
+        grids.append(game.serialize())
+    return grids
+
+
+class GameStateTest(unittest.TestCase):
+    GAME_CLASSES = (game_regular.RegularGame, BufferedGame)
+
+    def test_restore(self):
+        for cls in self.GAME_CLASSES:
+            with self.subTest(game=cls.__name__):
+                game = cls(seed=1, animation=False)
+                play(game, 3)
+
+                snapshot = game.snapshot()
+                expected = play(game, 5)
+                game.restore(snapshot)
+                self.assertEqual(play(game, 5), expected)
+
+    def test_clone(self):
+        for cls in self.GAME_CLASSES:
+            with self.subTest(game=cls.__name__):
+                game = cls(seed=2, animation=False)
+                play(game, 3)
+
+                clone = game.clone()
+                self.assertEqual(play(clone, 5), play(game, 5))
+
+    def test_serialize_state(self):
+        for cls in self.GAME_CLASSES:
+            with self.subTest(game=cls.__name__):
+                game = cls(seed=3, animation=False)
+                play(game, 3)
+
+                state = json.loads(json.dumps(game.serialize_state()))
+                loaded = cls.deserialize_state(state, animation=False)
+                self.assertEqual(play(loaded, 5), play(game, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
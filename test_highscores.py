@@ -0,0 +1,122 @@
+"""Tests that the high score managers keep & order the same records."""
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import highscores
+
+__author__ = "Benjamin Martin and Brae Webb"
+__copyright__ = "Copyright 2017, The University of Queensland"
+__license__ = "MIT"
+__version__ = "1.1.2"
+
+
+class Grid:
+    """Stand-in for a game, serializing to a fixed grid."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def serialize(self):
+        return [[(1, self._value), (2, 1)], [(None, 0), (3, self._value)]]
+
+
+class BackendParityTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def _managers(self, top_scores=3):
+        """(tuple<HighScoreManager, SQLiteHighScoreManager>) Returns a new
+        manager of each backend."""
+        directory = self._directory.name
+        json_manager = highscores.HighScoreManager(
+            os.path.join(directory, "highscores.json"), top_scores=top_scores)
+        sqlite_manager = highscores.SQLiteHighScoreManager(
+            os.path.join(directory, "highscores.db"), top_scores=top_scores)
+        self.addCleanup(sqlite_manager.close)
+        return json_manager, sqlite_manager
+
+    def assertSameRecords(self, json_manager, sqlite_manager):
+        # Grids read back from json have lists in place of tuples
+        for method in ("get_data", "get_sorted_data"):
+            self.assertEqual(
+                json.loads(json.dumps(getattr(json_manager, method)())),
+                json.loads(json.dumps(getattr(sqlite_manager, method)())))
+        self.assertEqual(json_manager.get_headers(),
+                         sqlite_manager.get_headers())
+
+    def test_ties(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                self.setUp()
+                managers = self._managers()
+                rng = random.Random(seed)
+
+                for name in range(12):
+                    score = rng.randint(0, 5)
+                    for manager in managers:
+                        manager.record(score, Grid(name), name)
+                    self.assertSameRecords(*managers)
+
+    def test_replace_record(self):
+        managers = self._managers(top_scores=4)
+        for name, score in enumerate((4, 2, 4, 3)):
+            for manager in managers:
+                manager.record(score, Grid(name), name)
+
+        replacement = {"score": 1, "name": "new", "grid": Grid(9).serialize()}
+        for manager in managers:
+            manager.replace_record(4, replacement)
+            manager.record(2, Grid(10), 10)
+        self.assertSameRecords(*managers)
+
+    def test_reopen(self):
+        managers = self._managers(top_scores=5)
+        for name, score in enumerate((3, 1, 3, 2, 1)):
+            for manager in managers:
+                manager.record(score, Grid(name), name)
+        managers[1].save()
+
+        self.assertSameRecords(*self._managers(top_scores=3))
+
+
+class WriteAheadTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self._file = os.path.join(directory.name, "highscores.json")
+
+    def test_failed_compaction(self):
+        manager = highscores.HighScoreManager(self._file, top_scores=10,
+                                              write_ahead=True,
+                                              compact_after=None)
+        for score in range(3):
+            manager.record(score, Grid(score), "a{}".format(score))
+
+        def fail(data):
+            raise OSError("Disk full")
+
+        manager._write_json = fail
+        with self.assertRaises(OSError):
+            manager.compact()
+        del manager._write_json
+
+        for score in range(3, 5):
+            manager.record(score, Grid(score), "b{}".format(score))
+        manager.compact()
+
+        with open(self._file) as file:
+            records = json.load(file)["regular"]
+        self.assertEqual(sorted(record["name"] for record in records),
+                         ["a0", "a1", "a2", "b3", "b4"])
+        self.assertEqual(
+            [name for name in os.listdir(os.path.dirname(self._file))
+             if name.endswith((".log", ".compacting", ".tmp"))], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -38,6 +38,10 @@
                           So Look Again.
 """
 
+import base64
+import collections
+from array import array
+
 import game_regular
 from model import AbstractTileGenerator
 
@@ -48,7 +52,9 @@ __version__ = "1.1.2"
 
 
 class LoadedGenerator(AbstractTileGenerator):
-    """Tile generator based upon the values of a serialized grid."""
+    """Tile generator based upon the values of a serialized grid.
+
+    Deprecated: use a ReplayGenerator of a recorded TileStream instead."""
 
     def __init__(self, grid):
         """Constructor
@@ -84,4 +90,249 @@ class WeightedGenerator(AbstractTileGenerator):
 
     def generate(self, position):
         """(AbstractTile) Generates a new tile."""
-        return self._constructor(self._selector.choose(), position)
\ No newline at end of file
+        return self._constructor(self._selector.choose(), position)
+
+    def generate_many(self, positions):
+        """(list<AbstractTile>) Generates a new tile for each position, drawing
+        all selections in one batch."""
+        constructor = self._constructor
+        selections = self._selector.choose_many(len(positions))
+        return [constructor(selection, position)
+                for selection, position in zip(selections, positions)]
+
+
+class BufferedGenerator(WeightedGenerator):
+    """Tile generator which draws selections from a WeightedSelector ahead of
+    time, in batches, into a buffer.
+
+    Buffered selections are discarded whenever the selector's weights change,
+    so every tile is drawn according to the current weights. Discarded
+    selections still consume the selector's random numbers, so a seeded game
+    generates different tiles with a BufferedGenerator than with a
+    WeightedGenerator."""
+
+    def __init__(self, selector, constructor, size=64):
+        """Constructor
+
+        Parameters:
+            selector (WeightedSelector): The weighted selector to choose from.
+            constructor (function):
+                    Callable which returns the tile. Accepts two arguments:
+                    constructor(selection, position)
+                        - selection: The value returned from selector.choose()
+                        - position: The position passed to the generate method.
+            size (int): The number of selections to draw in each batch.
+        """
+        super().__init__(selector, constructor)
+        self._size = size
+        self._buffer = collections.deque()
+        self._version = selector.get_version()
+
+    def _validate(self):
+        """Discards the buffered selections if the weights have changed."""
+        version = self._selector.get_version()
+        if version != self._version:
+            self._buffer.clear()
+            self._version = version
+
+    def prefetch(self):
+        """Refills the buffer to its full size."""
+        self._validate()
+        missing = self._size - len(self._buffer)
+        if missing > 0:
+            self._buffer.extend(self._selector.choose_many(missing))
+
+    def get_state(self):
+        """(list<*>) Returns the buffered selections."""
+        self._validate()
+        return list(self._buffer)
+
+    def set_state(self, state):
+        """Replaces the buffered selections. They are taken to be drawn with
+        the selector's current weights.
+
+        Parameters:
+            state (list<*>): Selections returned by get_state, or None for an
+                             empty buffer.
+        """
+        self._buffer = collections.deque(state or ())
+        self._version = self._selector.get_version()
+
+    def _take(self, n):
+        """(list<*>) Removes and returns the next n selections, refilling the
+        buffer when it runs out."""
+        self._validate()
+        buffer = self._buffer
+        if len(buffer) < n:
+            buffer.extend(self._selector.choose_many(n - len(buffer) +
+                                                     self._size))
+        return [buffer.popleft() for _ in range(n)]
+
+    def generate(self, position):
+        """(AbstractTile) Generates a new tile."""
+        return self._constructor(self._take(1)[0], position)
+
+    def generate_many(self, positions):
+        """(list<AbstractTile>) Generates a new tile for each position."""
+        constructor = self._constructor
+        return [constructor(selection, position)
+                for selection, position in zip(self._take(len(positions)),
+                                               positions)]
+
+
+class TileStream:
+    """Append-only record of the selections tiles were generated from.
+
+    Each distinct selection is stored once; the stream itself holds a single
+    byte per tile."""
+
+    def __init__(self, symbols=(), codes=b''):
+        """Constructor
+
+        Parameters:
+            symbols (iterable(*)): The distinct selections, in order of code.
+            codes (bytes): The code of each recorded selection.
+        """
+        self._symbols = list(symbols)
+        self._lookup = {symbol: code for code, symbol in
+                        enumerate(self._symbols)}
+        self._codes = array('B', codes)
+
+    def _encode(self, selection):
+        """(int) Returns the code for a selection, adding it if it is new."""
+        code = self._lookup.get(selection)
+        if code is None:
+            code = len(self._symbols)
+            if code > 255:
+                raise ValueError("Too many distinct selections.")
+            self._lookup[selection] = code
+            self._symbols.append(selection)
+        return code
+
+    def append(self, selection):
+        """Records a selection."""
+        self._codes.append(self._encode(selection))
+
+    def extend(self, selections):
+        """Records each of a sequence of selections."""
+        # Encoded in full first, so nothing is recorded if any selection fails
+        self._codes.extend([self._encode(selection)
+                            for selection in selections])
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __getitem__(self, index):
+        """(*) Returns the selection at an index in the stream."""
+        return self._symbols[self._codes[index]]
+
+    def __iter__(self):
+        """Yields each recorded selection, in order."""
+        symbols = self._symbols
+        for code in self._codes:
+            yield symbols[code]
+
+    def serialize(self):
+        """(dict<str, *>) Serializes the stream so it can be saved as json."""
+        return {
+            "symbols": list(self._symbols),
+            "codes": base64.b64encode(self._codes.tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def deserialize(cls, data):
+        """(TileStream) Creates a stream from its serialized form."""
+        return cls(data["symbols"], base64.b64decode(data["codes"]))
+
+
+class RecordingGenerator(WeightedGenerator):
+    """Tile generator based upon WeightedSelector value, which records every
+    selection it generates a tile from."""
+
+    def __init__(self, selector, constructor, stream=None):
+        """Constructor
+
+        Parameters:
+            selector (WeightedSelector): The weighted selector to choose from.
+            constructor (function):
+                    Callable which returns the tile. Accepts two arguments:
+                    constructor(selection, position)
+                        - selection: The value returned from selector.choose()
+                        - position: The position passed to the generate method.
+            stream (TileStream): The stream to record to. Defaults to a new
+                                 stream.
+        """
+        super().__init__(selector, constructor)
+        self._stream = stream if stream is not None else TileStream()
+
+    def get_stream(self):
+        """(TileStream) Returns the stream being recorded to."""
+        return self._stream
+
+    def generate(self, position):
+        """(AbstractTile) Generates a new tile."""
+        selection = self._selector.choose()
+        self._stream.append(selection)
+        return self._constructor(selection, position)
+
+    def generate_many(self, positions):
+        """(list<AbstractTile>) Generates a new tile for each position."""
+        constructor = self._constructor
+        selections = self._selector.choose_many(len(positions))
+        self._stream.extend(selections)
+        return [constructor(selection, position)
+                for selection, position in zip(selections, positions)]
+
+
+class ReplayGenerator(AbstractTileGenerator):
+    """Tile generator which replays the selections of a recorded TileStream, in
+    order."""
+
+    def __init__(self, stream, constructor, start=0):
+        """Constructor
+
+        Parameters:
+            stream (TileStream): The stream to replay.
+            constructor (function):
+                    Callable which returns the tile. Accepts two arguments:
+                    constructor(selection, position)
+                        - selection: The next selection in the stream.
+                        - position: The position passed to the generate method.
+            start (int): The index of the first selection to replay.
+        """
+        self._stream = stream
+        self._constructor = constructor
+        self._index = start
+
+    def get_index(self):
+        """(int) Returns the index of the next selection to replay."""
+        return self._index
+
+    def generate(self, position):
+        """(AbstractTile) Generates a new tile.
+
+        Raises:
+            IndexError: If the stream has been exhausted.
+        """
+        if self._index >= len(self._stream):
+            raise IndexError("Tile stream is exhausted.")
+
+        selection = self._stream[self._index]
+        self._index += 1
+        return self._constructor(selection, position)
+
+    def generate_many(self, positions):
+        """(list<AbstractTile>) Generates a new tile for each position.
+
+        Raises:
+            IndexError: If the stream has too few selections remaining.
+        """
+        start, end = self._index, self._index + len(positions)
+        if end > len(self._stream):
+            raise IndexError("Tile stream is exhausted.")
+
+        self._index = end
+        constructor = self._constructor
+        stream = self._stream
+        return [constructor(stream[index], position)
+                for index, position in zip(range(start, end), positions)]